@@ -7,22 +7,21 @@ from __future__ import annotations
 import argparse
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List
-
-import soundfile as sf
+from typing import Dict, List, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.analysis.audio_analysis import analyze_track
+from src.analysis.audio_analysis import analyze_track_cached
 from src.generation.composition import build_musicgen_prompt
-from src.generation.musicgen_backend import MusicGenBackend
+from src.generation.musicgen_backend import get_backend
 from src.generation.mixdown import mix_backing_and_vocal
-from src.style.style_profile import build_style_profile, describe_style_with_llm
-from src.lyrics import generate_lyrics, lyrics_to_text
+from src.style.style_profile import build_style_profile, describe_style_with_llm_cached
+from src.lyrics import generate_lyrics_cached, lyrics_to_text
 from src.melody import generate_simple_melody_midi
 from src.vocals.vocal_synthesis import (
     synthesize_vocals_external_engine,
@@ -32,12 +31,52 @@ from src.vocals.recorded_vocal_loader import find_latest_recorded_vocal
 
 
 SUPPORTED_EXTENSIONS = {".wav", ".mp3", ".flac", ".ogg", ".m4a"}
+_SUPPORTED_EXT_NAMES = frozenset(ext.lstrip(".") for ext in SUPPORTED_EXTENSIONS)
 
 
 def _list_audio_files(root: Path) -> List[Path]:
-    return sorted(
-        [path for path in root.rglob("*") if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS]
-    )
+    found: List[str] = []
+    pending = [os.fspath(root)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                    continue
+                _, dot, ext = entry.name.rpartition(".")
+                if dot and ext.lower() in _SUPPORTED_EXT_NAMES and entry.is_file():
+                    found.append(entry.path)
+    return sorted(Path(path) for path in found)
+
+
+def _analyze_references(reference_paths: List[Path]) -> List[dict]:
+    """
+    Analyze reference tracks in parallel worker processes, preserving input order.
+    """
+    for path in reference_paths:
+        print(f"Analyzing {path.name}...")
+    max_workers = max(1, min(len(reference_paths), os.cpu_count() or 1))
+    if max_workers == 1:
+        return [analyze_track_cached(str(path)) for path in reference_paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(analyze_track_cached, map(str, reference_paths)))
+
+
+def _write_lyrics_and_melody(style_profile: Dict, style_text: str, timestamp: str) -> Tuple[Dict, Path, Path]:
+    """
+    Generate lyrics and the placeholder melody, returning (lyrics, lyrics_path, melody_path).
+    """
+    lyrics = generate_lyrics_cached(style_profile, style_text)
+    lyrics_dir = Path("outputs/lyrics")
+    lyrics_dir.mkdir(parents=True, exist_ok=True)
+    lyrics_path = lyrics_dir / f"{timestamp}_lyrics.txt"
+    lyrics_path.write_text(lyrics_to_text(lyrics), encoding="utf-8")
+
+    melody_dir = Path("outputs/melody")
+    melody_dir.mkdir(parents=True, exist_ok=True)
+    melody_path = melody_dir / f"{timestamp}_melody.mid"
+    generate_simple_melody_midi(style_profile, lyrics, melody_path)
+    return lyrics, lyrics_path, melody_path
 
 
 def _build_prompt_variations(base_prompt: str) -> List[str]:
@@ -75,41 +114,43 @@ def main():
 
     print(f"Found {len(reference_paths)} reference tracks.")
 
-    features = []
-    for path in reference_paths:
-        print(f"Analyzing {path.name}...")
-        features.append(analyze_track(str(path)))
+    features = _analyze_references(reference_paths)
 
     style_profile = build_style_profile(features)
-    style_text = describe_style_with_llm(style_profile)
-    print("Style description:")
-    print(style_text)
-
-    lyrics = generate_lyrics(style_profile, style_text)
-    lyrics_text = lyrics_to_text(lyrics)
-    lyrics_dir = Path("outputs/lyrics")
-    lyrics_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    lyrics_path = lyrics_dir / f"{timestamp}_lyrics.txt"
-    lyrics_path.write_text(lyrics_text, encoding="utf-8")
-    print(f"Lyrics saved to {lyrics_path}")
 
-    melody_dir = Path("outputs/melody")
-    melody_dir.mkdir(parents=True, exist_ok=True)
-    melody_path = melody_dir / f"{timestamp}_melody.mid"
-    generate_simple_melody_midi(style_profile, lyrics, melody_path)
+    # Background threads start only after the analysis pool has shut down, so no
+    # worker is forked while another thread holds locks.
+    background = ThreadPoolExecutor(max_workers=2)
+    try:
+        # Load MusicGen while the style description request is in flight.
+        backend_future = background.submit(get_backend)
+        style_text = describe_style_with_llm_cached(style_profile)
+        print("Style description:")
+        print(style_text)
+
+        # Lyrics (network) and melody only feed the vocals, so they run during generation.
+        lyrics_future = background.submit(_write_lyrics_and_melody, style_profile, style_text, timestamp)
+
+        base_prompt = build_musicgen_prompt(style_profile, style_text)
+        prompts = _build_prompt_variations(base_prompt)
+
+        print("Generating music with prompts:")
+        for idx, prompt in enumerate(prompts, start=1):
+            print(f"Prompt {idx}: {prompt}")
+
+        backend = backend_future.result()
+        clips = backend.generate_clips(prompts, duration=20)
+
+        lyrics, lyrics_path, melody_path = lyrics_future.result()
+    except BaseException:
+        # Surface the failure right away instead of blocking on a model load still in flight.
+        background.shutdown(wait=False, cancel_futures=True)
+        raise
+    background.shutdown()
+    print(f"Lyrics saved to {lyrics_path}")
     print(f"Melody MIDI saved to {melody_path}")
 
-    base_prompt = build_musicgen_prompt(style_profile, style_text)
-    prompts = _build_prompt_variations(base_prompt)
-
-    print("Generating music with prompts:")
-    for idx, prompt in enumerate(prompts, start=1):
-        print(f"Prompt {idx}: {prompt}")
-
-    backend = MusicGenBackend()
-    clips = backend.generate_clips(prompts, duration=20)
-
     output_dir = Path("outputs/demos")
     output_dir.mkdir(parents=True, exist_ok=True)
     final_dir = Path("outputs/final_mix")
@@ -124,8 +165,7 @@ def main():
         backend.save_wav(clip, backing_path, backend.sample_rate)
         print(f"Saved {backing_path}")
 
-        data, sr = sf.read(backing_path)
-        duration_seconds = len(data) / sr if len(data) else 20.0
+        duration_seconds = len(clip) / backend.sample_rate if len(clip) else 20.0
 
         vocal_out_path = output_dir / f"demo_{idx:02d}_vocal.wav"
         if vocal_source == "placeholder":
@@ -158,7 +198,7 @@ def main():
 
         final_mix_path = final_dir / f"demo_{idx:02d}_mix.wav"
         mix_backing_and_vocal(
-            backing_path=backing_path,
+            backing_path=(clip, backend.sample_rate),
             vocal_path=vocal_path,
             out_path=final_mix_path,
             vocal_gain_db=-3.0,
@@ -4,11 +4,17 @@ Audio analysis utilities for extracting simple statistics from reference tracks.
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import operator
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional
 
 import librosa
 import numpy as np
+import scipy.fft
+import scipy.signal
 
 # Frequency band definitions (in Hz) for low, mid, and high energy regions.
 FREQUENCY_BANDS: Dict[str, tuple[float, float | None]] = {
@@ -17,11 +23,70 @@ FREQUENCY_BANDS: Dict[str, tuple[float, float | None]] = {
     "high": (2000.0, None),
 }
 
+# Default location for cached analyze_track results.
+ANALYSIS_CACHE_DIR = Path.home() / ".cache" / "ai-music-refs" / "analysis"
+# Bump when analyze_track output changes so stale cache entries are ignored.
+_ANALYSIS_CACHE_VERSION = 2
 
-def _mean_magnitude(magnitude: np.ndarray, mask: np.ndarray) -> float:
-    if not mask.any():
-        return 0.0
-    return float(np.mean(magnitude[mask]))
+# Tracks are resampled to this rate on load; its 11 kHz Nyquist covers every band.
+ANALYSIS_SAMPLE_RATE = 22050
+
+# STFT parameters matching librosa.stft defaults.
+N_FFT = 2048
+HOP_LENGTH = 512
+# Number of frames transformed per rFFT call; bounds the spectrum held in memory.
+_FRAME_BLOCK = 256
+
+
+@functools.lru_cache(maxsize=32)
+def _band_bin_layout(sr: int, n_fft: int) -> tuple[tuple[str, ...], np.ndarray, np.ndarray]:
+    """
+    Return band names sorted by frequency, their first FFT bin, and their bin counts.
+
+    The bands in FREQUENCY_BANDS are contiguous, so each band ends where the next
+    one starts and a single np.add.reduceat over the start bins sums every band.
+    Results are cached per (sr, n_fft); the returned arrays are read-only.
+    """
+    freqs = librosa.fft_frequencies(sr=sr, n_fft=n_fft)
+    names = sorted(FREQUENCY_BANDS, key=lambda band: FREQUENCY_BANDS[band][0])
+    starts: List[int] = []
+    counts: List[int] = []
+    for band in names:
+        low, high = FREQUENCY_BANDS[band]
+        start = int(np.searchsorted(freqs, low, side="left"))
+        stop = len(freqs) if high is None else int(np.searchsorted(freqs, high, side="left"))
+        starts.append(start)
+        counts.append(max(0, stop - start))
+    start_bins = np.asarray(starts, dtype=np.intp)
+    bin_counts = np.asarray(counts, dtype=np.intp)
+    start_bins.setflags(write=False)
+    bin_counts.setflags(write=False)
+    return tuple(names), start_bins, bin_counts
+
+
+def _band_energy(y: np.ndarray, sr: int, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH) -> Dict[str, float]:
+    """
+    Mean STFT magnitude per frequency band, accumulated block-by-block.
+    """
+    padded = np.pad(y, n_fft // 2, mode="constant")
+    frames = librosa.util.frame(padded, frame_length=n_fft, hop_length=hop_length)
+    window = scipy.signal.get_window("hann", n_fft, fftbins=True).astype(frames.dtype)
+    names, starts, counts = _band_bin_layout(int(sr), n_fft)
+    # Bands starting at or above Nyquist are empty and cannot be passed to reduceat.
+    in_range = starts < n_fft // 2 + 1
+    sums = np.zeros(len(names), dtype=np.float64)
+
+    n_frames = frames.shape[1]
+    for start in range(0, n_frames, _FRAME_BLOCK):
+        block = frames[:, start : start + _FRAME_BLOCK] * window[:, None]
+        magnitude = np.abs(scipy.fft.rfft(block, axis=0, workers=-1))
+        sums[in_range] += np.add.reduceat(magnitude, starts[in_range], axis=0).sum(axis=1)
+
+    means = {
+        band: float(total / (count * n_frames)) if count else 0.0
+        for band, total, count in zip(names, sums, counts)
+    }
+    return {band: means[band] for band in FREQUENCY_BANDS}
 
 
 def analyze_track(path: str | Path) -> dict:
@@ -32,20 +97,16 @@ def analyze_track(path: str | Path) -> dict:
     if not audio_path.exists():
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-    y, sr = librosa.load(audio_path.as_posix(), sr=None, mono=True)
+    y, sr = librosa.load(
+        audio_path,
+        sr=ANALYSIS_SAMPLE_RATE,
+        mono=True,
+        dtype=np.float32,
+        res_type="soxr_hq",
+    )
     tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
 
-    stft = librosa.stft(y)
-    magnitude = np.abs(stft)
-    freqs = librosa.fft_frequencies(sr=sr, n_fft=stft.shape[0] * 2 - 2)
-
-    band_energy: Dict[str, float] = {}
-    for band, (low, high) in FREQUENCY_BANDS.items():
-        mask = freqs >= low
-        if high is not None:
-            mask &= freqs < high
-        band_energy[band] = _mean_magnitude(magnitude, mask)
-
+    band_energy = _band_energy(y, sr)
     duration = float(len(y) / sr)
 
     return {
@@ -55,6 +116,36 @@ def analyze_track(path: str | Path) -> dict:
     }
 
 
+def _analysis_cache_key(audio_path: Path) -> str:
+    stat = audio_path.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(audio_path.resolve()).encode("utf-8"))
+    digest.update(f"|{stat.st_size}|{stat.st_mtime_ns}|v{_ANALYSIS_CACHE_VERSION}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def analyze_track_cached(path: str | Path, cache_dir: Optional[Path] = None) -> dict:
+    """
+    Like analyze_track, but reuse results stored on disk for unchanged files.
+    """
+    audio_path = Path(path)
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+    root = Path(cache_dir) if cache_dir is not None else ANALYSIS_CACHE_DIR
+    cache_path = root / f"{_analysis_cache_key(audio_path)}.json"
+    if cache_path.exists():
+        try:
+            return json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    features = analyze_track(audio_path)
+    root.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(json.dumps(features).encode("utf-8"))
+    return features
+
+
 def _extract_band_names(feature_dicts: Iterable[dict]) -> List[str]:
     feature_iter = iter(feature_dicts)
     try:
@@ -74,15 +165,16 @@ def aggregate_style_stats(features: List[dict]) -> dict:
     if not features:
         raise ValueError("features list must not be empty")
 
-    tempos = np.array([float(f["tempo"]) for f in features], dtype=float)
-    tempo_range = [float(np.min(tempos)), float(np.max(tempos))]
-    tempo_mean = float(np.mean(tempos))
+    tempos = np.fromiter((f["tempo"] for f in features), dtype=np.float64, count=len(features))
+    tempo_range = [float(tempos.min()), float(tempos.max())]
+    tempo_mean = float(tempos.mean())
 
     band_names = _extract_band_names(features)
-    energy_profile = {}
-    for band in band_names:
-        values = [float(f["band_energy"][band]) for f in features]
-        energy_profile[band] = float(np.mean(values))
+    # itemgetter pulls a whole row of band values per track in one C-level call.
+    row = operator.itemgetter(*band_names)
+    energies = np.array([row(f["band_energy"]) for f in features], dtype=np.float64)
+    energies = energies.reshape(len(features), len(band_names))
+    energy_profile = dict(zip(band_names, energies.mean(axis=0).tolist()))
 
     return {
         "tempo_range": tempo_range,
@@ -0,0 +1,61 @@
+"""
+Low-level WAV writing helpers shared by the synthesis and mixing modules.
+"""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+import numpy as np
+
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+# Silent files are a canonical 44-byte header followed by zero bytes streamed from this block.
+_SILENCE_CHUNK = 1 << 16
+_SILENCE_BYTES = memoryview(bytes(_SILENCE_CHUNK))
+
+
+def pcm16_wav_header(num_samples: int, sample_rate: int) -> bytes:
+    """
+    Canonical 44-byte RIFF header for num_samples of mono 16-bit PCM.
+    """
+    data_size = 2 * num_samples
+    return _WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, 2 * sample_rate, 2, 16,
+        b"data", data_size,
+    )
+
+
+def write_silence(path: Path, num_samples: int, sample_rate: int) -> None:
+    """
+    Write num_samples of mono 16-bit silence without going through libsndfile or NumPy.
+    """
+    with open(path, "wb", buffering=1 << 20) as handle:
+        handle.write(pcm16_wav_header(num_samples, sample_rate))
+        remaining = 2 * num_samples
+        while remaining:
+            count = min(_SILENCE_CHUNK, remaining)
+            handle.write(_SILENCE_BYTES[:count])
+            remaining -= count
+
+
+def quantize_pcm16(
+    block: np.ndarray, scratch: np.ndarray, out: np.ndarray, scale: float = 1.0
+) -> np.ndarray:
+    """
+    Convert float samples (times scale) to int16 exactly as libsndfile's PCM_16 writer would.
+
+    floor(x * 32768) clipped to the int16 range is libsndfile's own float conversion, so
+    buffer_write of the result matches SoundFile.write of the float block byte for byte.
+    Multiplying by 32768 is exact, so folding a float32 scale into it matches scaling first.
+    scratch (float32) and out (int16) must hold at least len(block) frames.
+    """
+    scaled = scratch[: len(block)]
+    np.multiply(block, np.float32(32768.0 * float(np.float32(scale))), out=scaled)
+    np.floor(scaled, out=scaled)
+    np.clip(scaled, -32768.0, 32767.0, out=scaled)
+    pcm = out[: len(block)]
+    np.copyto(pcm, scaled, casting="unsafe")
+    return pcm
@@ -4,14 +4,83 @@ High-level mixdown utilities that orchestrate combining stems into a master trac
 
 from __future__ import annotations
 
+import math
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Tuple, Union
 
 import numpy as np
 import soundfile as sf
+from scipy.signal import resample_poly
 
+from src.audio_io import quantize_pcm16
 from src.mixing import mix_stems
 
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is installed alongside librosa
+    numba = None
+
+# Either a path to an audio file or an in-memory (samples, sample_rate) pair.
+AudioSource = Union[Path, str, Tuple[np.ndarray, int]]
+
+# Frames mixed and written per block by mix_backing_and_vocal.
+_MIX_BLOCK = 65536
+
+
+def _mix_into_numpy(backing: np.ndarray, vocal: np.ndarray, gain: np.float32, out: np.ndarray) -> float:
+    np.multiply(vocal, gain, out=out)
+    np.add(out, backing, out=out)
+    return float(np.max(np.abs(out))) if out.size else 0.0
+
+
+def _scale_inplace_numpy(out: np.ndarray, scale: np.float32) -> None:
+    out *= scale
+
+
+if numba is not None:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _mix_into(backing, vocal, gain, out):  # pragma: no cover - compiled
+        """
+        Write backing + vocal * gain into out in one pass and return the peak magnitude.
+        """
+        peak = np.float32(0.0)
+        for i in numba.prange(out.shape[0]):
+            for ch in range(out.shape[1]):
+                value = backing[i, ch] + vocal[i, ch] * gain
+                out[i, ch] = value
+                peak = max(peak, abs(value))
+        return peak
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _scale_inplace(out, scale):  # pragma: no cover - compiled
+        for i in numba.prange(out.shape[0]):
+            for ch in range(out.shape[1]):
+                out[i, ch] *= scale
+
+else:
+    _mix_into = _mix_into_numpy
+    _scale_inplace = _scale_inplace_numpy
+
+
+def _peak_abs(data: np.ndarray) -> float:
+    if not data.size:
+        return 0.0
+    return float(max(data.max(), -data.min()))
+
+
+def _padded_block(data: np.ndarray, start: int, stop: int, scratch: np.ndarray) -> np.ndarray:
+    """
+    Return data[start:stop], zero-filling past the end of data via scratch.
+    """
+    chunk = data[start:stop]
+    length = stop - start
+    if len(chunk) == length:
+        return chunk
+    scratch[: len(chunk)] = chunk
+    scratch[len(chunk) : length] = 0.0
+    return scratch[:length]
+
 
 def create_final_mix(
     accompaniment: Iterable[Path],
@@ -26,56 +95,100 @@ def create_final_mix(
     return mix_stems(stems, Path(out_path))
 
 
+def _read_audio(source: AudioSource) -> tuple[np.ndarray, int]:
+    if isinstance(source, tuple):
+        data, sr = source
+        return np.asarray(data), int(sr)
+    # Decode straight to float32 instead of reading float64 and casting a second copy.
+    return sf.read(source, dtype="float32")
+
+
 def mix_backing_and_vocal(
-    backing_path: Path,
-    vocal_path: Path,
+    backing_path: AudioSource,
+    vocal_path: AudioSource,
     out_path: Path,
     vocal_gain_db: float = -3.0,
+    subtype: str = "PCM_16",
 ) -> Path:
     """
     Mix a backing track and vocal track into a new WAV file.
+
+    Each input may be a file path or an in-memory ``(samples, sample_rate)`` tuple.
+    The mix is written as 16-bit PCM; pass ``subtype="FLOAT"`` for intermediates
+    that will be processed further.
+
+    Mixing streams in fixed-size blocks. When the inputs' peaks could sum past full
+    scale, the blocks are mixed once more (from the decoded arrays, not from disk) to
+    find the exact peak before any output is written; otherwise there is a single pass.
     """
-    backing, sr = sf.read(backing_path)
-    vocal, sr_v = sf.read(vocal_path)
+    backing, sr = _read_audio(backing_path)
+    vocal, sr_v = _read_audio(vocal_path)
+
+    def _as_float32(data: np.ndarray) -> np.ndarray:
+        data = np.asarray(data)
+        if data.dtype != np.float32:
+            data = data.astype(np.float32, copy=False)
+        if data.ndim == 2 and data.shape[1] > 2:
+            return data[:, :2]
+        return data
 
     def _to_stereo(data: np.ndarray) -> np.ndarray:
-        data = np.asarray(data, dtype=np.float32)
+        # Mono input becomes a read-only broadcast view; later steps allocate new arrays.
         if data.ndim == 1:
-            return np.stack((data, data), axis=1)
+            return np.broadcast_to(data[:, None], (len(data), 2))
         if data.shape[1] == 1:
-            return np.repeat(data, 2, axis=1)
-        if data.shape[1] > 2:
-            return data[:, :2]
+            return np.broadcast_to(data, (len(data), 2))
         return data
 
-    backing = _to_stereo(backing)
+    backing = _to_stereo(_as_float32(backing))
+    vocal = _as_float32(vocal)
+
+    # Resample before widening to stereo so a mono vocal is filtered once, not per channel.
+    if sr_v != sr and len(vocal):
+        g = math.gcd(sr, sr_v)
+        vocal = resample_poly(vocal, sr // g, sr_v // g, axis=0)
     vocal = _to_stereo(vocal)
 
-    if sr_v != sr:
-        target_len = int(round(len(vocal) * sr / sr_v))
-        if target_len <= 0:
-            target_len = len(backing)
-        old_idx = np.linspace(0, len(vocal) - 1, num=len(vocal))
-        new_idx = np.linspace(0, len(vocal) - 1, num=target_len)
-        resampled = []
-        for ch in range(vocal.shape[1]):
-            resampled.append(np.interp(new_idx, old_idx, vocal[:, ch]))
-        vocal = np.stack(resampled, axis=1).astype(np.float32)
-
-    if len(backing) != len(vocal):
-        max_length = max(len(backing), len(vocal))
-        pad_width_back = ((0, max_length - len(backing)), (0, 0))
-        pad_width_voc = ((0, max_length - len(vocal)), (0, 0))
-        backing = np.pad(backing, pad_width_back, mode="constant")
-        vocal = np.pad(vocal, pad_width_voc, mode="constant")
-
-    gain = 10 ** (vocal_gain_db / 20.0)
-    mix = backing + vocal * gain
-
-    peak = np.max(np.abs(mix))
-    if peak > 1.0:
-        mix = mix / peak * 0.99
+    total = max(len(backing), len(vocal))
+    gain = np.float32(10 ** (vocal_gain_db / 20.0))
+    block = np.empty((min(_MIX_BLOCK, total), 2), dtype=np.float32)
+    backing_scratch = np.empty_like(block)
+    vocal_scratch = np.empty_like(block)
+
+    def _mix_block(start: int) -> tuple[np.ndarray, float]:
+        stop = min(start + _MIX_BLOCK, total)
+        out = block[: stop - start]
+        peak = _mix_into(
+            _padded_block(backing, start, stop, backing_scratch),
+            _padded_block(vocal, start, stop, vocal_scratch),
+            gain,
+            out,
+        )
+        return out, float(peak)
+
+    # |backing + gain * vocal| never exceeds this bound, so the exact peak (and
+    # the extra mixing pass it needs) is only required when the mix could clip.
+    bound = _peak_abs(backing) + float(gain) * _peak_abs(vocal)
+    peak = 0.0
+    if bound > 1.0:
+        for start in range(0, total, _MIX_BLOCK):
+            peak = max(peak, _mix_block(start)[1])
+    scale = np.float32(0.99 / peak) if peak > 1.0 else None
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    sf.write(out_path.as_posix(), mix.astype(np.float32), sr)
+    # PCM_16 blocks are quantized here and passed through as raw int16 buffers.
+    pcm16 = subtype == "PCM_16"
+    pcm_block = np.empty(block.shape, dtype=np.int16) if pcm16 else None
+    with sf.SoundFile(out_path, "w", samplerate=sr, channels=2, subtype=subtype) as handle:
+        for start in range(0, total, _MIX_BLOCK):
+            out, _ = _mix_block(start)
+            if pcm16:
+                # The normalization gain rides along with the int16 conversion.
+                gain_out = 1.0 if scale is None else scale
+                pcm = quantize_pcm16(out, backing_scratch, pcm_block, gain_out)
+                handle.buffer_write(pcm, dtype="int16")
+            else:
+                if scale is not None:
+                    _scale_inplace(out, scale)
+                handle.write(out)
     return out_path
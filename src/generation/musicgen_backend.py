@@ -4,6 +4,9 @@ Wrapper utilities around AudioCraft's MusicGen model for prompt-based audio gene
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import os
 from pathlib import Path
 from typing import List, Sequence
 
@@ -13,27 +16,79 @@ import torch
 from audiocraft.models import MusicGen
 
 
+DEFAULT_MODEL_NAME = "facebook/musicgen-small"
+
+
+def _resolve_device(device: str | None) -> str:
+    return str(device) if device else ("cuda" if torch.cuda.is_available() else "cpu")
+
+
 class MusicGenBackend:
     """
     Thin wrapper around AudioCraft's MusicGen model.
+
+    half_precision (CUDA only) casts the LM, including its T5 conditioner, and the EnCodec
+    model to float16. It is opt-in: MusicGen already runs the LM under fp16 autocast on CUDA,
+    and T5 can overflow in fp16, so the full-weight cast only suits memory-bound setups.
     """
 
-    def __init__(self, model_name: str = "facebook/musicgen-small", device: str | None = None):
-        resolved_device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        device: str | None = None,
+        *,
+        half_precision: bool = False,
+        compile_lm: bool = False,
+    ):
+        resolved_device = _resolve_device(device)
         self.device = resolved_device
         self.model = MusicGen.get_pretrained(model_name, device=resolved_device)
         self.sample_rate = getattr(self.model, "sample_rate", 32000)
 
-    def generate_clips(self, prompts: Sequence[str], duration: int = 20) -> List[np.ndarray]:
+        # FP16 weights are only used on GPU when requested; CPU inference stays in FP32.
+        self.dtype = torch.float16 if half_precision and str(resolved_device).startswith("cuda") else None
+        if self.dtype is not None:
+            self.model.lm = self.model.lm.to(dtype=self.dtype)
+            self.model.compression_model = self.model.compression_model.to(dtype=self.dtype)
+        if compile_lm and hasattr(torch, "compile"):
+            self.model.lm = torch.compile(self.model.lm, mode="reduce-overhead", fullgraph=False)
+
+    def _autocast(self):
+        if self.dtype is not None:
+            return torch.autocast(device_type="cuda", dtype=self.dtype)
+        return contextlib.nullcontext()
+
+    def warm_up(self) -> None:
+        """
+        Run a one-second generation so CUDA context, caches and kernels are ready.
+        """
+        self.model.set_generation_params(duration=1)
+        with torch.inference_mode(), self._autocast():
+            self.model.generate(["warmup"], progress=False)
+
+    def generate_clips(
+        self,
+        prompts: Sequence[str],
+        duration: int = 20,
+        batch_size: int = 4,
+    ) -> List[np.ndarray]:
         """
-        Generate audio clips for each prompt.
+        Generate audio clips for each prompt, at most batch_size prompts per model call.
         """
         if not prompts:
             raise ValueError("prompts must contain at least one prompt")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
 
         self.model.set_generation_params(duration=duration)
-        with torch.no_grad():
-            generated = self.model.generate(prompts)
+        prompt_list = list(prompts)
+        generated = []
+        # Each batch's descriptions go through the T5 conditioner in one forward pass.
+        # Shared prompt prefixes are not cached separately: T5 attends bidirectionally,
+        # so prefix hidden states change with the suffix and cannot be reused.
+        with torch.inference_mode(), self._autocast():
+            for start in range(0, len(prompt_list), batch_size):
+                generated.extend(self.model.generate(prompt_list[start : start + batch_size]))
 
         clips: List[np.ndarray] = []
         for clip in generated:
@@ -47,7 +102,8 @@ class MusicGenBackend:
             else:
                 wave = np.asarray(tensor, dtype=np.float32)
 
-            wave = np.asarray(wave, dtype=np.float32)
+            if wave.dtype != np.float32:
+                wave = wave.astype(np.float32, copy=False)
             if wave.ndim > 1:
                 wave = np.squeeze(wave, axis=0)
             clips.append(wave)
@@ -55,10 +111,39 @@ class MusicGenBackend:
         return clips
 
     @staticmethod
-    def save_wav(wave: np.ndarray, path: str | Path, sample_rate: int) -> None:
+    def save_wav(wave: np.ndarray, path: str | Path, sample_rate: int, subtype: str = "PCM_16") -> None:
         """
-        Save a waveform to disk as a WAV file.
+        Save a waveform to disk as a WAV file (16-bit PCM unless another subtype is given).
         """
         output_path = Path(path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        sf.write(output_path.as_posix(), np.asarray(wave, dtype=np.float32), sample_rate)
+        wave = np.asarray(wave)
+        if wave.dtype != np.float32:
+            wave = wave.astype(np.float32, copy=False)
+        sf.write(output_path, np.ascontiguousarray(wave), sample_rate, subtype=subtype)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_backend(model_name: str, device: str, half_precision: bool, compile_lm: bool) -> MusicGenBackend:
+    return MusicGenBackend(model_name, device, half_precision=half_precision, compile_lm=compile_lm)
+
+
+def get_backend(
+    model_name: str | None = None,
+    device: str | None = None,
+    *,
+    half_precision: bool = False,
+    compile_lm: bool = False,
+) -> MusicGenBackend:
+    """
+    Return a process-wide MusicGenBackend, loading it on first use.
+
+    The model name and device are normalized before the cache lookup, so get_backend(),
+    get_backend(DEFAULT_MODEL_NAME) and an explicit default device all share one model.
+    Use _load_backend.cache_clear() to drop cached models.
+    """
+    return _load_backend(model_name or DEFAULT_MODEL_NAME, _resolve_device(device), half_precision, compile_lm)
+
+
+if os.getenv("AI_MUSIC_PRELOAD") == "1":
+    get_backend().warm_up()
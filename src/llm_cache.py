@@ -0,0 +1,32 @@
+"""
+Lightweight helpers shared by the LLM-backed features for caching responses on disk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+# Default location for cached LLM outputs keyed by style fingerprint.
+LLM_CACHE_DIR = Path.home() / ".cache" / "ai-music-refs" / "llm"
+
+
+def style_fingerprint(style_profile: Dict[str, Any], *extra: str) -> str:
+    """
+    Stable hash of a style profile, rounded to the precision the prompts use.
+
+    Extra strings (model name, style text, theme, cache version, ...) are folded into the hash.
+    """
+    energy = style_profile.get("energy_profile") or {}
+    canonical = {
+        "tempo_range": [round(float(value), 1) for value in style_profile.get("tempo_range") or []],
+        "tempo_mean": round(float(style_profile.get("tempo_mean") or 0.0), 1),
+        "energy_profile": {band: round(float(value), 3) for band, value in energy.items()},
+    }
+    digest = hashlib.blake2b(json.dumps(canonical, sort_keys=True).encode("utf-8"), digest_size=16)
+    for part in extra:
+        digest.update(b"\0")
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()
@@ -2,6 +2,6 @@
 Lyrics generation utilities.
 """
 
-from .lyrics_generator import generate_lyrics, lyrics_to_text
+from .lyrics_generator import generate_lyrics, generate_lyrics_cached, lyrics_to_text
 
-__all__ = ["generate_lyrics", "lyrics_to_text"]
+__all__ = ["generate_lyrics", "generate_lyrics_cached", "lyrics_to_text"]
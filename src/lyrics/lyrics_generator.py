@@ -6,10 +6,52 @@ from __future__ import annotations
 
 import os
 import json
+from pathlib import Path
 from typing import Dict, List, Optional
 
 from openai import OpenAI, OpenAIError
 
+from src.llm_cache import LLM_CACHE_DIR, style_fingerprint
+
+# Bump when _build_messages, _LYRICS_SCHEMA or the result normalization changes so stale
+# cached lyrics are ignored.
+_LLM_CACHE_VERSION = 1
+
+
+# Structured-output schema so the Responses API returns lyrics JSON directly.
+_LYRICS_SCHEMA: Dict = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "language": {"type": "string"},
+        "theme": {"type": ["string", "null"]},
+        "sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "type": {"type": "string"},
+                    "name": {"type": "string"},
+                    "lines": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["type", "name", "lines"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["title", "language", "theme", "sections"],
+    "additionalProperties": False,
+}
+
+_LYRICS_TEXT_FORMAT: Dict = {
+    "format": {
+        "type": "json_schema",
+        "name": "lyrics",
+        "schema": _LYRICS_SCHEMA,
+        "strict": True,
+    }
+}
+
 
 def _create_openai_client() -> OpenAI:
     api_key = os.getenv("OPENAI_API_KEY")
@@ -37,13 +79,16 @@ def _format_style_context(style_profile: Dict) -> str:
 
 
 def _build_messages(style_profile: Dict, style_text: str, theme: Optional[str]) -> List[Dict[str, str]]:
+    # Static instructions come first and per-song inputs last, so repeated requests
+    # share a cacheable prompt prefix.
     style_context = _format_style_context(style_profile)
     topic_text = theme or "由你推断的主题"
     user_prompt = (
         "你是一名专业华语作词人。根据以下音乐风格信息与主题，"
         "创作完整中文歌词，至少包含两个 verse 和一个 chorus，可选 pre-chorus。"
         "歌词需押韵、富有画面感，正文必须是中文，标题可以使用简短英文。"
-        "整首歌控制在 3-5 个段落，每段 4-8 行。最终使用 JSON 输出，字段结构严格如下：\n"
+        "整首歌控制在 3-5 个段落，每段 4-8 行。"
+        "最终使用 JSON 输出，字段结构严格如下：\n"
         '{\n'
         '  "title": "歌名",\n'
         '  "language": "zh",\n'
@@ -162,11 +207,13 @@ def generate_lyrics(style_profile: Dict, style_text: str, theme: str | None = No
     client = _create_openai_client()
     messages = _build_messages(style_profile, style_text, theme)
     try:
-        response = client.responses.create(model="gpt-5.1", input=messages)
+        response = client.responses.create(model="gpt-5.1", input=messages, text=_LYRICS_TEXT_FORMAT)
     except OpenAIError as exc:
         raise RuntimeError("Failed to generate lyrics") from exc
 
     text = _extract_response_text(response)
+    # Structured outputs make this a plain json.loads; the text fallback only
+    # covers clients or models that ignore the requested format.
     result = _parse_json_safe(text)
     if theme and not result.get("theme"):
         result["theme"] = theme
@@ -174,6 +221,30 @@ def generate_lyrics(style_profile: Dict, style_text: str, theme: str | None = No
     return result
 
 
+def generate_lyrics_cached(
+    style_profile: Dict,
+    style_text: str,
+    theme: str | None = None,
+    cache_dir: Optional[Path] = None,
+) -> Dict:
+    """
+    Like generate_lyrics, but reuse lyrics cached for the same style, style text and theme.
+    """
+    root = Path(cache_dir) if cache_dir is not None else LLM_CACHE_DIR
+    fingerprint = style_fingerprint(style_profile, style_text, theme or "", f"v{_LLM_CACHE_VERSION}")
+    cache_path = root / f"lyrics_{fingerprint}.json"
+    if cache_path.exists():
+        try:
+            return json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    result = generate_lyrics(style_profile, style_text, theme=theme)
+    root.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+    return result
+
+
 def lyrics_to_text(lyrics: Dict) -> str:
     """
     把结构化歌词字典转成可读多行文本，便于保存为 .txt。
@@ -0,0 +1,33 @@
+"""
+Compact JSON serialization shared by the modules that write synthesis manifests.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to compact stdlib json
+    orjson = None
+
+
+def _to_builtin(value: Any) -> Any:
+    """
+    Convert NumPy scalars and arrays (anything exposing tolist) to plain Python values.
+    """
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def manifest_bytes(manifest: Dict[str, Any]) -> bytes:
+    """
+    Serialize a manifest as compact UTF-8 JSON, via orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(manifest, default=_to_builtin, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        manifest, ensure_ascii=False, separators=(",", ":"), default=_to_builtin
+    ).encode("utf-8")
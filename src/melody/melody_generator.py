@@ -4,11 +4,12 @@ Placeholder melody generation utilities producing simple MIDI-ready data.
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Sequence, Optional
-import random
 
+import numpy as np
 from mido import Message, MetaMessage, MidiFile, MidiTrack
 
 
@@ -32,17 +33,24 @@ _KEY_TO_ROOT = {
     "B": 71,
 }
 
-_MAJOR_INTERVALS = [0, 2, 4, 5, 7, 9, 11]
-_MINOR_INTERVALS = [0, 2, 3, 5, 7, 8, 10]
+# Interval tables stay tuples so they can key the lru_cache below.
+_MAJOR_INTERVALS = (0, 2, 4, 5, 7, 9, 11)
+_MINOR_INTERVALS = (0, 2, 3, 5, 7, 8, 10)
 
 
-def _build_scale_pitches(root: int, intervals: Sequence[int], octaves: int = 2) -> List[int]:
-    values: List[int] = []
-    for octave in range(-1, octaves + 1):
-        offset = 12 * octave
-        for interval in intervals:
-            values.append(root + interval + offset)
-    return sorted(set(values))
+@functools.lru_cache(maxsize=16)
+def _build_scale_pitches(root: int, intervals: Sequence[int], octaves: int = 2) -> np.ndarray:
+    """
+    Sorted, de-duplicated scale pitches from one octave below root up to octaves above.
+
+    The result is a read-only, C-contiguous int16 array that is shared between calls, so the
+    walk can fancy-index it by scale degree without copying or casting.
+    """
+    offsets = 12 * np.arange(-1, octaves + 1, dtype=np.int16)
+    values = root + np.asarray(intervals, dtype=np.int16)[None, :] + offsets[:, None]
+    pitches = np.ascontiguousarray(np.unique(values), dtype=np.int16)
+    pitches.setflags(write=False)
+    return pitches
 
 
 def _choose_scale(style_profile: Dict | None) -> tuple[int, Sequence[int]]:
@@ -58,6 +66,45 @@ def _choose_scale(style_profile: Dict | None) -> tuple[int, Sequence[int]]:
     return _KEY_TO_ROOT["A"], _MINOR_INTERVALS
 
 
+def _max_scale_step(pool: np.ndarray, max_interval: int) -> int:
+    """
+    Largest number of scale degrees any pitch in pool can move without exceeding max_interval.
+    """
+    step = 0
+    while step + 1 < len(pool) and int((pool[step + 1 :] - pool[: -(step + 1)]).max()) <= max_interval:
+        step += 1
+    return step
+
+
+def _walk(
+    pool: np.ndarray,
+    total_steps: int,
+    max_interval: int,
+    start_pitch: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Random walk over scale degrees of the sorted pool, starting at start_pitch.
+
+    All degree deltas are drawn at once and accumulated with cumsum. The running degree is
+    folded back into the pool at its ends (a triangle wave, which never widens a step), so
+    adjacent notes stay within max_interval by construction.
+    """
+    if total_steps <= 0:
+        return np.empty(0, dtype=pool.dtype)
+    step = _max_scale_step(pool, max_interval)
+    deltas = rng.integers(-step, step + 1, size=total_steps)
+    deltas[0] = 0
+    degrees = int(np.searchsorted(pool, start_pitch)) + np.cumsum(deltas)
+    top = len(pool) - 1
+    if top:
+        degrees = np.mod(degrees, 2 * top)
+        degrees = np.where(degrees > top, 2 * top - degrees, degrees)
+    else:
+        degrees[:] = 0
+    return pool[degrees]
+
+
 def generate_placeholder_melody(
     style_profile: Optional[Dict] = None,
     *,
@@ -75,32 +122,20 @@ def generate_placeholder_melody(
         raise ValueError("bars must be positive")
 
     root, scale = _choose_scale(style_profile)
-    scale_pool = _build_scale_pitches(root, scale, octaves=2)
+    # Sorted pool, so the walk moves in scale degrees and indexes pitches directly.
+    pool = _build_scale_pitches(root, tuple(scale), 2)
     note_duration = 1.0  # quarter-note granularity
-    total_steps = int(bars * beats_per_bar)
 
     seed_value = int(style_profile.get("tempo_mean", 0)) if style_profile else 0
-    rng = random.Random(seed_value)
-
-    notes: List[MelodyNote] = []
-    last_pitch = root + scale[0]
-    for step in range(total_steps):
-        if not notes:
-            pitch = last_pitch
-        else:
-            candidates = [p for p in scale_pool if abs(p - last_pitch) <= max_interval]
-            if not candidates:
-                candidates = [last_pitch]
-            pitch = rng.choice(candidates)
-
-        start = step * note_duration
-        notes.append(MelodyNote(pitch=pitch, start_beat=start, duration=note_duration))
-        last_pitch = pitch
-
-        if beats_per_bar > 0 and (step + 1) % beats_per_bar == 0:
-            last_pitch = root + scale[0]
+    rng = np.random.default_rng(seed_value & 0xFFFFFFFF)
+    total_steps = int(bars * beats_per_bar)
+    pitches = _walk(pool, total_steps, max_interval, root + scale[0], rng)
 
-    return notes
+    starts = np.arange(total_steps, dtype=np.float64) * note_duration
+    return [
+        MelodyNote(pitch=pitch, start_beat=start, duration=note_duration)
+        for pitch, start in zip(pitches.tolist(), starts.tolist())
+    ]
 
 
 def melody_to_midi(
@@ -124,20 +159,30 @@ def melody_to_midi(
 
     sorted_notes = sorted(notes, key=lambda n: n.start_beat)
     ticks_per_beat = midi.ticks_per_beat
-    current_tick = 0
-    for note in sorted_notes:
-        start_tick = int(note.start_beat * ticks_per_beat)
-        delta = max(0, start_tick - current_tick)
-        track.append(Message("note_on", note=note.pitch, velocity=note.velocity, time=delta))
-        current_tick = start_tick
-
-        end_tick = start_tick + max(1, int(note.duration * ticks_per_beat))
-        track.append(Message("note_off", note=note.pitch, velocity=0, time=end_tick - current_tick))
-        current_tick = end_tick
+    count = len(sorted_notes)
+    beats = np.fromiter((n.start_beat for n in sorted_notes), dtype=np.float64, count=count)
+    durations = np.fromiter((n.duration for n in sorted_notes), dtype=np.float64, count=count)
+
+    start_ticks = (beats * ticks_per_beat).astype(np.int64)
+    duration_ticks = np.maximum(1, (durations * ticks_per_beat).astype(np.int64))
+    end_ticks = start_ticks + duration_ticks
+    # Each note_on is relative to the previous note_off; overlapping notes start immediately.
+    on_deltas = np.maximum(0, start_ticks - np.concatenate(([0], end_ticks[:-1])))
+
+    track.extend(
+        [
+            message
+            for note, on_delta, off_delta in zip(sorted_notes, on_deltas.tolist(), duration_ticks.tolist())
+            for message in (
+                Message("note_on", note=note.pitch, velocity=note.velocity, time=on_delta),
+                Message("note_off", note=note.pitch, velocity=0, time=off_delta),
+            )
+        ]
+    )
 
     output_path = Path(path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    midi.save(output_path.as_posix())
+    midi.save(output_path)
 
 
 def generate_simple_melody_midi(
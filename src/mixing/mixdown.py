@@ -5,52 +5,98 @@ Simple mixing placeholders for combining accompaniment and vocal stems.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable
 
 import numpy as np
 import soundfile as sf
 
+from src.audio_io import quantize_pcm16
 
-def _load_wave(path: Path) -> tuple[np.ndarray, int]:
-    data, sr = sf.read(path)
-    if data.ndim > 1:
-        data = np.mean(data, axis=1)
-    return data.astype(np.float32), sr
+
+# Frames read per block when streaming stems from disk.
+_STREAM_BLOCK = 65536
+# Stems whose peak stays below this (e.g. placeholder vocals) are left out of the mix.
+_SILENCE_THRESHOLD = 1e-6
+
+
+def _write_mix(path: Path, mix: np.ndarray, scale: float, sample_rate: int) -> None:
+    """
+    Write mix * scale block by block, letting soundfile infer the format from path.
+
+    PCM_16 blocks are quantized here and passed through as raw int16 buffers.
+    """
+    scale = np.float32(scale)
+    scratch = np.empty(min(_STREAM_BLOCK, len(mix)), dtype=np.float32)
+    with sf.SoundFile(path, "w", samplerate=sample_rate, channels=1) as handle:
+        pcm16 = handle.subtype == "PCM_16"
+        pcm_block = np.empty(scratch.shape, dtype=np.int16) if pcm16 else None
+        for start in range(0, len(mix), _STREAM_BLOCK):
+            block = mix[start : start + _STREAM_BLOCK]
+            if scale != 1.0:
+                block *= scale
+            if pcm16:
+                handle.buffer_write(quantize_pcm16(block, scratch, pcm_block), dtype="int16")
+            else:
+                handle.write(block)
+
+
+def _stream_add(path: Path, mix: np.ndarray) -> float:
+    """
+    Add a stem into mix block by block, downmixing to mono, and return its peak.
+
+    Blocks that are effectively silent are skipped instead of being summed.
+    """
+    scratch = np.empty(_STREAM_BLOCK, dtype=np.float32)
+    peak = 0.0
+    offset = 0
+    for block in sf.blocks(path, blocksize=_STREAM_BLOCK, dtype="float32", always_2d=True):
+        frames = block.shape[0]
+        channels = block.shape[1]
+        if channels == 1:
+            mono = block[:, 0]
+        else:
+            # Sum into scratch and apply the 1/channels of the mean in place.
+            mono = scratch[:frames]
+            np.sum(block, axis=1, out=mono)
+            np.multiply(mono, np.float32(1.0 / channels), out=mono)
+        block_peak = float(max(mono.max(), -mono.min()))
+        if block_peak > _SILENCE_THRESHOLD:
+            target = mix[offset : offset + frames]
+            np.add(target, mono, out=target)
+            peak = max(peak, block_peak)
+        offset += frames
+    return peak
 
 
 def mix_stems(stems: Iterable[Path], out_path: Path) -> Path:
     """
     Mix multiple mono stems into a single mono WAV.
     """
-    stems = list(stems)
+    stems = [Path(stem) for stem in stems]
     if len(stems) < 2:
         raise ValueError("Provide at least two stems to mix.")
 
-    audio_arrays: List[np.ndarray] = []
     sample_rate: int | None = None
     max_length = 0
     for stem in stems:
-        data, sr = _load_wave(Path(stem))
+        info = sf.info(stem)
         if sample_rate is None:
-            sample_rate = sr
-        elif sr != sample_rate:
+            sample_rate = info.samplerate
+        elif info.samplerate != sample_rate:
             raise ValueError("All stems must share the same sample rate.")
-        audio_arrays.append(data)
-        max_length = max(max_length, len(data))
+        max_length = max(max_length, info.frames)
 
-    stacked = []
-    for data in audio_arrays:
-        if len(data) < max_length:
-            padded = np.pad(data, (0, max_length - len(data)), mode="constant")
-        else:
-            padded = data
-        stacked.append(padded)
+    mix = np.zeros(max_length, dtype=np.float32)
+    active = sum(_stream_add(stem, mix) > _SILENCE_THRESHOLD for stem in stems)
 
-    mix = np.sum(stacked, axis=0) / len(stacked)
-    peak = np.max(np.abs(mix))
+    # Fold the 1/N averaging gain and peak normalization into a single scale, applied
+    # per block while writing.
+    # Silent stems do not count towards N; a lone active stem is only normalized.
+    scale = 1.0 / active if active > 1 else 1.0
+    peak = float(max(mix.max(), -mix.min())) * scale if mix.size else 0.0
     if peak > 1.0:
-        mix /= peak
+        scale /= peak
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    sf.write(out_path.as_posix(), mix.astype(np.float32), sample_rate or 44100)
+    _write_mix(out_path, mix, scale, sample_rate or 44100)
     return out_path
@@ -4,13 +4,12 @@ Placeholder singing synthesis module that records the expected inputs/outputs.
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional
 
-import numpy as np
-import soundfile as sf
+from src.audio_io import write_silence
+from src.manifest_json import manifest_bytes
 
 
 @dataclass
@@ -44,8 +43,7 @@ class SingingSynthesizer:
         request.output_dir.mkdir(parents=True, exist_ok=True)
         output_path = request.output_dir / request.output_name
         num_samples = max(1, int(request.sample_rate * request.duration_seconds))
-        buffer = np.zeros(num_samples, dtype=np.float32)
-        sf.write(output_path.as_posix(), buffer, request.sample_rate)
+        write_silence(output_path, num_samples, request.sample_rate)
 
         manifest = {
             "backend": self.backend_name,
@@ -62,5 +60,5 @@ class SingingSynthesizer:
             "duration_seconds": request.duration_seconds,
         }
         manifest_path = output_path.with_suffix(".json")
-        manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+        manifest_path.write_bytes(manifest_bytes(manifest))
         return output_path
@@ -5,12 +5,20 @@ descriptions of a reference collection using the OpenAI Responses API.
 
 from __future__ import annotations
 
+import functools
+import json
 import os
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from openai import OpenAI, OpenAIError
 
 from src.analysis.audio_analysis import aggregate_style_stats
+from src.llm_cache import LLM_CACHE_DIR, style_fingerprint
+
+# Bump when _build_prompt or the description post-processing changes so stale cached
+# descriptions are ignored.
+_LLM_CACHE_VERSION = 1
 
 
 def build_style_profile(track_features: List[dict]) -> Dict[str, Any]:
@@ -29,10 +37,7 @@ def build_style_profile(track_features: List[dict]) -> Dict[str, Any]:
 
 
 def _format_energy_profile(energy_profile: Dict[str, float]) -> str:
-    parts = []
-    for band, value in energy_profile.items():
-        parts.append(f"{band.capitalize()} energy: {value:.3f}")
-    return ", ".join(parts)
+    return ", ".join(f"{band.capitalize()} energy: {value:.3f}" for band, value in energy_profile.items())
 
 
 def _build_prompt(style_profile: Dict[str, Any]) -> List[Dict[str, str]]:
@@ -64,27 +69,38 @@ def _build_prompt(style_profile: Dict[str, Any]) -> List[Dict[str, str]]:
 
 def _extract_response_text(response: Any) -> str:
     text = getattr(response, "output_text", None)
-    if isinstance(text, str) and text.strip():
-        return text.strip()
-
-    output = getattr(response, "output", None)
-    if output:
-        chunks: List[str] = []
-        for item in output:
-            for content in getattr(item, "content", []):
-                content_text = getattr(content, "text", None)
-                if content_text:
-                    chunks.append(content_text)
-        if chunks:
-            return "\n".join(chunk.strip() for chunk in chunks if chunk.strip())
+    if isinstance(text, str):
+        text = text.strip()
+        if text:
+            return text
+
+    output = getattr(response, "output", None) or ()
+    joined = "\n".join(
+        stripped
+        for item in output
+        for content in getattr(item, "content", ())
+        if (stripped := (getattr(content, "text", None) or "").strip())
+    )
+    if joined:
+        return joined
     raise RuntimeError("Failed to extract text from OpenAI response")
 
 
+@functools.lru_cache(maxsize=1)
+def _openai_client_for(api_key: str) -> OpenAI:
+    """
+    Process-wide client per API key, so repeat calls reuse its connection pool.
+
+    The SDK client is thread-safe; call _openai_client_for.cache_clear() to drop it.
+    """
+    return OpenAI(api_key=api_key)
+
+
 def _create_openai_client() -> OpenAI:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY environment variable is required")
-    return OpenAI(api_key=api_key)
+    return _openai_client_for(api_key)
 
 
 def describe_style_with_llm(
@@ -107,3 +123,27 @@ def describe_style_with_llm(
 
     description = _extract_response_text(response)
     return description.strip()
+
+
+def describe_style_with_llm_cached(
+    style_profile: Dict[str, Any],
+    *,
+    model: str = "gpt-5.1",
+    cache_dir: Optional[Path] = None,
+) -> str:
+    """
+    Like describe_style_with_llm, but reuse descriptions cached for the same style.
+    """
+    root = Path(cache_dir) if cache_dir is not None else LLM_CACHE_DIR
+    fingerprint = style_fingerprint(style_profile, model, f"v{_LLM_CACHE_VERSION}")
+    cache_path = root / f"style_{fingerprint}.json"
+    if cache_path.exists():
+        try:
+            return json.loads(cache_path.read_text(encoding="utf-8"))["description"]
+        except (OSError, KeyError, json.JSONDecodeError):
+            pass
+
+    description = describe_style_with_llm(style_profile, model=model)
+    root.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(json.dumps({"description": description}, ensure_ascii=False).encode("utf-8"))
+    return description
@@ -4,26 +4,44 @@ Utility helpers for locating recorded vocal tracks.
 
 from __future__ import annotations
 
+import os
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 DEFAULT_RECORDED_DIR = Path("data/recorded")
 
 
+def _iter_wavs(root: str) -> Iterator[Tuple[str, float]]:
+    """
+    Yield (path, mtime) for every .wav under root, using DirEntry's cached metadata.
+
+    A missing root raises; subdirectories that vanish mid-walk are skipped.
+    """
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            if directory is root:
+                raise
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.lower().endswith(".wav") and entry.is_file():
+                    yield entry.path, entry.stat().st_mtime
+
+
 def find_latest_recorded_vocal(root: Optional[Path | str] = None) -> Optional[Path]:
     """
     Return the newest .wav inside the recorded directory (defaults to data/recorded).
     """
     search_root = Path(root) if root is not None else DEFAULT_RECORDED_DIR
-    if not search_root.exists():
-        return None
-
-    candidates = [
-        path
-        for path in search_root.rglob("*")
-        if path.is_file() and path.suffix.lower() == ".wav"
-    ]
-    if not candidates:
+    try:
+        latest = max(_iter_wavs(os.fspath(search_root)), key=itemgetter(1), default=None)
+    except (FileNotFoundError, NotADirectoryError):
         return None
-
-    return max(candidates, key=lambda p: p.stat().st_mtime)
+    return Path(latest[0]) if latest is not None else None
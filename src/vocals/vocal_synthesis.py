@@ -5,15 +5,18 @@ Configurable vocal synthesis utilities with a placeholder backend.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Callable, Dict, Optional, Literal
+from typing import Callable, Dict, List, Optional, Literal, Tuple
+import contextlib
+import hashlib
 import os
 import shlex
 import subprocess
 import tempfile
 
 import json
-import numpy as np
-import soundfile as sf
+
+from src.audio_io import write_silence
+from src.manifest_json import manifest_bytes
 
 
 VocalBackend = Literal["placeholder", "ai", "voice_clone", "diffsinger"]
@@ -29,6 +32,25 @@ def register_vocal_backend(name: VocalBackend, backend: VocalBackendImpl) -> Non
     _VOCAL_BACKENDS[name] = backend
 
 
+def _command_argv(cmd_template: str, values: Dict) -> List[str]:
+    """
+    Split a VOCAL_ENGINE_CMD template into argv, then fill placeholders per token.
+
+    Splitting before substitution keeps resolved paths intact as single arguments,
+    including Windows backslashes and spaces. Placeholders that expand to an empty
+    string (e.g. an unset {ref_dir}) are dropped rather than passed as "".
+    """
+    posix = os.name != "nt"
+    argv = []
+    for token in shlex.split(cmd_template, posix=posix):
+        if not posix and len(token) >= 2 and token[0] == token[-1] and token[0] in "\"'":
+            token = token[1:-1]
+        arg = token.format(**values)
+        if arg or not token:
+            argv.append(arg)
+    return argv
+
+
 def synthesize_vocals_external_engine(
     melody_midi: Path,
     lyrics_txt: Path,
@@ -50,12 +72,17 @@ def synthesize_vocals_external_engine(
         "out": str(out_wav.resolve()),
         "ref_dir": str(voice_ref_dir.resolve()) if voice_ref_dir else "",
     }
+    # Run the argv directly; VOCAL_ENGINE_SHELL=1 opts back into shell semantics (e.g. cmd.exe builtins).
+    shell = os.getenv("VOCAL_ENGINE_SHELL") == "1"
     try:
-        command_str = cmd_template.format(**resolved_paths)
+        if shell:
+            command = cmd_template.format(**resolved_paths)
+        else:
+            command = _command_argv(cmd_template, resolved_paths)
     except KeyError as exc:
         raise ValueError(f"Missing placeholder in VOCAL_ENGINE_CMD template: {exc}") from exc
 
-    subprocess.run(command_str, shell=True, check=True)
+    subprocess.run(command, shell=shell, check=True)
 
     if not out_wav.exists() or out_wav.stat().st_size == 0:
         raise RuntimeError(f"External vocal engine did not create a valid output at {out_wav}.")
@@ -81,8 +108,7 @@ def synthesize_vocals_placeholder(
     sample_rate = 44100
     duration = max(0.1, float(duration_seconds) if duration_seconds is not None else 5.0)
     num_samples = int(sample_rate * duration)
-    data = np.zeros(num_samples, dtype=np.float32)
-    sf.write(out_wav.as_posix(), data, sample_rate)
+    write_silence(out_wav, num_samples, sample_rate)
 
     manifest = {
         "melody_midi": str(melody_midi),
@@ -94,7 +120,7 @@ def synthesize_vocals_placeholder(
         "duration": duration,
     }
     manifest_path = out_wav.with_suffix(".json")
-    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    manifest_path.write_bytes(manifest_bytes(manifest))
     return out_wav
 
 
@@ -119,19 +145,17 @@ def _run_external_engine(
         )
 
     duration = duration_seconds or 5.0
-    tmp_context = (
-        tempfile.TemporaryDirectory(dir=str(tmp_dir))
-        if tmp_dir is not None
-        else tempfile.TemporaryDirectory()
-    )
+    # A persistent tmp_dir keeps one asset folder per distinct lyrics across calls.
+    if tmp_dir is not None:
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_context = contextlib.nullcontext(None)
+    else:
+        tmp_context = tempfile.TemporaryDirectory()
     with tmp_context as tmpdir_str:
-        tmpdir = Path(tmpdir_str)
-        if tmp_dir is not None:
-            tmp_dir.mkdir(parents=True, exist_ok=True)
-        lyrics_json_path = tmpdir / "lyrics.json"
-        lyrics_txt_path = tmpdir / "lyrics.txt"
-        lyrics_json_path.write_text(json.dumps(lyrics, ensure_ascii=False, indent=2), encoding="utf-8")
-        _write_lyrics_txt(lyrics, lyrics_txt_path)
+        if tmpdir_str is None:
+            lyrics_json_path, lyrics_txt_path = _cached_lyrics_assets(lyrics, tmp_dir)
+        else:
+            lyrics_json_path, lyrics_txt_path = _write_lyrics_assets(lyrics, Path(tmpdir_str))
 
         format_map = {
             "melody_midi": melody_midi.as_posix(),
@@ -147,12 +171,10 @@ def _run_external_engine(
             "mode": mode,
         }
         try:
-            cmd_str = cmd_template.format(**format_map)
+            command = _command_argv(cmd_template, format_map)
         except KeyError as exc:
             raise ValueError(f"Missing placeholder in VOCAL_ENGINE_CMD template: {exc}") from exc
 
-        command = shlex.split(cmd_str)
-
         try:
             subprocess.run(command, check=True)
         except subprocess.CalledProcessError as exc:
@@ -166,6 +188,33 @@ def _run_external_engine(
     return True
 
 
+def _write_lyrics_assets(lyrics: Dict, directory: Path) -> Tuple[Path, Path]:
+    """
+    Write lyrics.json and lyrics.txt for the external engine into directory.
+    """
+    lyrics_json_path = directory / "lyrics.json"
+    lyrics_txt_path = directory / "lyrics.txt"
+    lyrics_json_path.write_bytes(json.dumps(lyrics, ensure_ascii=False, indent=2).encode("utf-8"))
+    _write_lyrics_txt(lyrics, lyrics_txt_path)
+    return lyrics_json_path, lyrics_txt_path
+
+
+def _cached_lyrics_assets(lyrics: Dict, tmp_dir: Path) -> Tuple[Path, Path]:
+    """
+    Reuse lyrics assets under tmp_dir/lyrics-<hash>, writing them only on first use.
+    """
+    canonical = json.dumps(lyrics, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    digest = hashlib.blake2b(canonical, digest_size=16).hexdigest()
+    directory = tmp_dir / f"lyrics-{digest}"
+    lyrics_json_path = directory / "lyrics.json"
+    lyrics_txt_path = directory / "lyrics.txt"
+    if lyrics_json_path.exists() and lyrics_txt_path.exists():
+        return lyrics_json_path, lyrics_txt_path
+
+    directory.mkdir(parents=True, exist_ok=True)
+    return _write_lyrics_assets(lyrics, directory)
+
+
 def _synthesize_with_diffsinger(
     melody_midi: Path,
     lyrics: Dict,
@@ -260,9 +309,10 @@ def _write_lyrics_txt(lyrics: Dict, path: Path) -> None:
 
 
 def _lyrics_to_text(lyrics: Dict) -> str:
-    lines = []
-    sections = lyrics.get("sections") or []
-    for section in sections:
-        sec_lines = section.get("lines") or []
-        lines.extend(str(line).strip() for line in sec_lines if str(line).strip())
-    return "\n".join(lines).strip() or lyrics.get("theme", "")
+    text = "\n".join(
+        stripped
+        for section in lyrics.get("sections") or []
+        for line in section.get("lines") or []
+        if (stripped := (line if isinstance(line, str) else str(line)).strip())
+    )
+    return text or (lyrics.get("theme") or "")
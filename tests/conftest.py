@@ -5,8 +5,16 @@ Ensures the project source tree is importable when running pytest from the repo
 
 from __future__ import annotations
 
+import math
+import os
+import shutil
 import sys
 from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import pytest
+
+from src.audio_io import pcm16_wav_header
 
 
 def pytest_configure():
@@ -14,3 +22,41 @@ def pytest_configure():
     src_path = repo_root / "src"
     if str(src_path) not in sys.path:
         sys.path.insert(0, str(src_path))
+
+
+def _fast_const_wav(path: Path, value: float, length: int, sr: int = 16000) -> Path:
+    """
+    Write a constant-valued mono PCM_16 WAV as one header plus a repeated sample.
+
+    The sample uses libsndfile's float conversion, so the bytes match sf.write.
+    """
+    sample = min(32767, max(-32768, math.floor(value * 32768.0)))
+    path.write_bytes(pcm16_wav_header(length, sr) + sample.to_bytes(2, "little", signed=True) * length)
+    return path
+
+
+@pytest.fixture(scope="session")
+def wave_factory(tmp_path_factory) -> Callable[..., Path]:
+    """
+    Place a constant-valued mono WAV at a path, encoding each (value, length, sr) only once.
+
+    Cached files are hard-linked into place (copied where links are unsupported), so tests
+    must treat the returned files as read-only inputs.
+    """
+    cache_dir = tmp_path_factory.mktemp("wav_cache")
+    cache: Dict[Tuple[float, int, int], Path] = {}
+
+    def factory(path: Path, value: float, length: int, sr: int = 16000) -> Path:
+        key = (value, length, sr)
+        cached = cache.get(key)
+        if cached is None:
+            cached = cache_dir / f"wave_{len(cache)}.wav"
+            _fast_const_wav(cached, value, length, sr)
+            cache[key] = cached
+        try:
+            os.link(cached, path)
+        except OSError:
+            shutil.copyfile(cached, path)
+        return path
+
+    return factory
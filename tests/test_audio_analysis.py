@@ -2,7 +2,8 @@ import numpy as np
 import pytest
 import soundfile as sf
 
-from src.analysis.audio_analysis import aggregate_style_stats, analyze_track
+from src.analysis import audio_analysis
+from src.analysis.audio_analysis import aggregate_style_stats, analyze_track, analyze_track_cached
 
 
 def test_analyze_track_on_sine_wave(tmp_path):
@@ -26,6 +27,24 @@ def test_analyze_track_on_sine_wave(tmp_path):
         assert band_energy[band] >= 0
 
 
+def test_analyze_track_cached_reuses_results(tmp_path, monkeypatch):
+    sr = 22050
+    audio_path = tmp_path / "tone.wav"
+    sf.write(audio_path, 0.25 * np.ones(sr // 2), sr)
+    cache_dir = tmp_path / "cache"
+
+    first = analyze_track_cached(audio_path, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    def fail(path):
+        raise AssertionError("analyze_track should not run on a cache hit")
+
+    monkeypatch.setattr(audio_analysis, "analyze_track", fail)
+    second = analyze_track_cached(audio_path, cache_dir=cache_dir)
+
+    assert second == first
+
+
 def test_aggregate_style_stats_computes_ranges():
     features = [
         {
@@ -1,4 +1,7 @@
 import json
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 
@@ -52,6 +55,8 @@ def test_generate_lyrics_returns_dict(monkeypatch):
     assert result["sections"][0]["type"] == "verse"
     kwargs = client.calls[0]
     assert kwargs["model"] == "gpt-5.1"
+    assert kwargs["text"]["format"]["type"] == "json_schema"
+    assert kwargs["text"]["format"]["schema"]["required"] == ["title", "language", "theme", "sections"]
     assert "Tempo" not in kwargs["input"][1]["content"]  # ensure Chinese prompt
     assert "标题可以使用简短英文" in kwargs["input"][1]["content"]
     assert "3-5 个段落" in kwargs["input"][1]["content"]
@@ -110,3 +115,55 @@ def test_prompt_includes_style_inputs(monkeypatch):
     assert style_text in prompt_text
     assert "88" in prompt_text and "104" in prompt_text
     assert result["title"] == "Echoes"
+
+
+def test_generate_lyrics_cached_skips_repeat_calls(monkeypatch, tmp_path):
+    style_profile = {"tempo_range": [88.0, 104.0], "tempo_mean": 96.0, "energy_profile": {"low": 0.5}}
+    lyrics_payload = {
+        "title": "Echoes",
+        "language": "zh",
+        "theme": "回声",
+        "sections": [{"type": "verse", "name": "Verse 1", "lines": ["第一行"]}],
+    }
+    client = _DummyClient(json.dumps(lyrics_payload))
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(lyrics_generator, "OpenAI", lambda api_key=None: client)
+
+    def generate(style_text):
+        return lyrics_generator.generate_lyrics_cached(
+            style_profile, style_text, theme="回声", cache_dir=tmp_path
+        )
+
+    first = generate("Mock style")
+    second = generate("Mock style")
+    generate("Other style")
+
+    assert first == second
+    assert second["title"] == "Echoes"
+    assert len(client.calls) == 2
+
+
+def test_generate_lyrics_cached_ignores_entries_from_older_versions(monkeypatch, tmp_path):
+    style_profile = {"tempo_range": [88.0, 104.0], "tempo_mean": 96.0, "energy_profile": {"low": 0.5}}
+    client = _DummyClient(json.dumps({"title": "Echoes", "sections": []}))
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(lyrics_generator, "OpenAI", lambda api_key=None: client)
+
+    lyrics_generator.generate_lyrics_cached(style_profile, "Mock style", cache_dir=tmp_path)
+    monkeypatch.setattr(lyrics_generator, "_LLM_CACHE_VERSION", lyrics_generator._LLM_CACHE_VERSION + 1)
+    lyrics_generator.generate_lyrics_cached(style_profile, "Mock style", cache_dir=tmp_path)
+
+    assert len(client.calls) == 2
+
+
+def test_lyrics_module_does_not_import_audio_analysis():
+    repo_root = Path(__file__).resolve().parent.parent
+    code = (
+        "import sys, src.lyrics; "
+        "sys.exit(int('librosa' in sys.modules or 'src.analysis.audio_analysis' in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=repo_root)
+
+    assert result.returncode == 0
@@ -1,7 +1,9 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
 
+from src.melody import melody_generator
 from src.melody import (
     generate_placeholder_melody,
     melody_to_midi,
@@ -54,3 +56,15 @@ def test_generate_simple_melody_midi(tmp_path: Path):
     result_path_2 = generate_simple_melody_midi({"energy_profile": {}}, lyrics, tmp_path / "simple2.mid", bpm=None)
     assert result_path_2.exists()
     assert result_path_2.stat().st_size > 0
+
+
+def test_melody_walk_stays_in_scale_within_interval():
+    pool = melody_generator._build_scale_pitches(60, (0, 2, 4, 5, 7, 9, 11), 2)
+    rng = np.random.default_rng(97)
+
+    pitches = melody_generator._walk(pool, 256, 5, 60, rng)
+
+    assert pitches.shape == (256,)
+    assert pitches[0] == 60
+    assert np.isin(pitches, pool).all()
+    assert np.abs(np.diff(pitches.astype(np.int64))).max() <= 5
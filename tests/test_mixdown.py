@@ -5,19 +5,30 @@ import pytest
 import soundfile as sf
 
 from src.mixing import mix_stems
+from src.mixing import mixdown as stem_mixdown
+from src.generation import mixdown as generation_mixdown
 from src.generation.mixdown import create_final_mix, mix_backing_and_vocal
 
+# Sample rate shared by the generated test stems (matches wave_factory's default).
+_SR = 16000
 
-def _write_wave(path: Path, value: float, length: int, sr: int = 16000):
-    data = np.full(length, value, dtype=np.float32)
-    sf.write(path.as_posix(), data, sr)
+# One period of a sine; test tones index into it instead of evaluating np.sin per sample.
+_SINE_TABLE = np.sin(np.linspace(0, 2 * np.pi, 1024, endpoint=False, dtype=np.float32))
 
 
-def test_mix_stems_combines_files(tmp_path: Path):
+def _sine(cycles: float, length: int) -> np.ndarray:
+    """
+    Table-lookup sine completing `cycles` periods over `length` samples.
+    """
+    phase = (np.arange(length, dtype=np.float64) * (1024 * cycles / length)).astype(np.int64)
+    return _SINE_TABLE[phase & 1023]
+
+
+def test_mix_stems_combines_files(tmp_path: Path, wave_factory):
     stem1 = tmp_path / "a.wav"
     stem2 = tmp_path / "b.wav"
-    _write_wave(stem1, 0.5, 1600)
-    _write_wave(stem2, -0.5, 800)
+    wave_factory(stem1, 0.5, 1600)
+    wave_factory(stem2, -0.5, 800)
 
     output = tmp_path / "mix.wav"
     mix_stems([stem1, stem2], output)
@@ -25,34 +36,94 @@ def test_mix_stems_combines_files(tmp_path: Path):
     assert output.exists()
     data, sr = sf.read(output)
     assert len(data) == 1600
-    assert sr == 16000
+    assert sr == _SR
     assert np.allclose(data[:800], 0.0)
     assert np.allclose(data[800:], 0.25)
 
 
-def test_mix_stems_requires_multiple_inputs(tmp_path: Path):
+def test_mix_stems_streams_stereo_stems(tmp_path: Path, monkeypatch, wave_factory):
+    stereo = tmp_path / "stereo.wav"
+    sf.write(stereo, np.column_stack((np.full(300, 0.6), np.full(300, 0.2))), _SR)
+    mono = tmp_path / "mono.wav"
+    wave_factory(mono, 0.4, 500)
+    monkeypatch.setattr(stem_mixdown, "_STREAM_BLOCK", 64)
+
+    output = tmp_path / "mix.wav"
+    mix_stems([stereo, mono], output)
+
+    data, _ = sf.read(output)
+    assert len(data) == 500
+    assert np.allclose(data[:300], 0.4, atol=1e-3)
+    assert np.allclose(data[300:], 0.2, atol=1e-3)
+
+
+def test_mix_stems_ignores_silent_stems(tmp_path: Path, wave_factory):
+    backing = tmp_path / "backing.wav"
+    silent = tmp_path / "silent.wav"
+    wave_factory(backing, 0.5, 400)
+    wave_factory(silent, 0.0, 400)
+
+    output = tmp_path / "mix.wav"
+    mix_stems([backing, silent], output)
+
+    data, _ = sf.read(output)
+    assert len(data) == 400
+    assert np.allclose(data, 0.5, atol=1e-3)
+
+
+def test_mix_stems_normalizes_hot_float_stems(tmp_path: Path):
+    hot = tmp_path / "hot.wav"
+    sf.write(hot, np.full(200, 1.6, dtype=np.float32), _SR, subtype="FLOAT")
+    quiet = tmp_path / "quiet.wav"
+    sf.write(quiet, np.full(200, 0.8, dtype=np.float32), _SR, subtype="FLOAT")
+
+    output = tmp_path / "mix.wav"
+    mix_stems([hot, quiet], output)
+
+    data, _ = sf.read(output)
+    # (1.6 + 0.8) / 2 = 1.2 peaks above full scale, so the mix is normalized to 1.0.
+    assert np.allclose(data, 1.0, atol=1e-3)
+
+
+def test_mix_stems_infers_format_from_extension(tmp_path: Path, monkeypatch, wave_factory):
+    stem1 = tmp_path / "a.wav"
+    stem2 = tmp_path / "b.wav"
+    wave_factory(stem1, 0.5, 300)
+    wave_factory(stem2, 0.25, 300)
+    monkeypatch.setattr(stem_mixdown, "_STREAM_BLOCK", 64)
+
+    output = tmp_path / "mix.flac"
+    mix_stems([stem1, stem2], output)
+
+    assert sf.info(output).format == "FLAC"
+    data, _ = sf.read(output)
+    assert len(data) == 300
+    assert np.allclose(data, 0.375, atol=1e-3)
+
+
+def test_mix_stems_requires_multiple_inputs(tmp_path: Path, wave_factory):
     stem1 = tmp_path / "single.wav"
-    _write_wave(stem1, 0.2, 100)
+    wave_factory(stem1, 0.2, 100)
 
     output = tmp_path / "mix.wav"
     with pytest.raises(ValueError):
         mix_stems([stem1], output)
 
 
-def test_create_final_mix_wraps_mixdown(tmp_path: Path):
+def test_create_final_mix_wraps_mixdown(tmp_path: Path, wave_factory):
     stem1 = tmp_path / "a.wav"
     stem2 = tmp_path / "b.wav"
-    _write_wave(stem1, 0.4, 200)
-    _write_wave(stem2, 0.4, 200)
+    wave_factory(stem1, 0.4, 200)
+    wave_factory(stem2, 0.4, 200)
 
     vocals = tmp_path / "vocals.wav"
-    _write_wave(vocals, -0.4, 200)
+    wave_factory(vocals, -0.4, 200)
 
     output = tmp_path / "final.wav"
     create_final_mix([stem1, stem2], vocals, output)
 
     data, sr = sf.read(output)
-    assert sr == 16000
+    assert sr == _SR
     # 0.4 + 0.4 - 0.4, divided by 3 tracks = ~0.1333
     assert np.allclose(data, 0.133333333, atol=1e-3)
 
@@ -65,17 +136,62 @@ def test_mix_backing_and_vocal_resamples_vocals(tmp_path: Path):
     backing = tmp_path / "back.wav"
     vocal = tmp_path / "voc.wav"
 
-    t_back = np.linspace(0, 1, length_back, endpoint=False)
-    t_voc = np.linspace(0, 1, length_vocal, endpoint=False)
-    backing_data = np.sin(2 * np.pi * 100 * t_back)
+    backing_data = _sine(100, length_back)
     sf.write(backing, np.column_stack((backing_data, backing_data)), sr_back)
-    sf.write(vocal, np.sin(2 * np.pi * 200 * t_voc), sr_vocal)
+    sf.write(vocal, _sine(200, length_vocal), sr_vocal)
 
     out_path = tmp_path / "mix.wav"
     mix_backing_and_vocal(backing, vocal, out_path, vocal_gain_db=-6.0)
 
     data, sr_out = sf.read(out_path)
+    assert sf.info(out_path).subtype == "PCM_16"
     assert sr_out == sr_back
     assert data.shape == (length_back, 2)
     assert out_path.exists()
     assert out_path.stat().st_size > 0
+
+
+def test_mix_backing_and_vocal_accepts_in_memory_audio(tmp_path: Path, wave_factory):
+    sr = _SR
+    vocal = tmp_path / "voc.wav"
+    wave_factory(vocal, 0.2, 400, sr)
+    backing = np.full(800, 0.3, dtype=np.float32)
+
+    out_path = tmp_path / "mix.wav"
+    mix_backing_and_vocal((backing, sr), vocal, out_path, vocal_gain_db=0.0)
+
+    data, sr_out = sf.read(out_path)
+    assert sr_out == sr
+    assert data.shape == (800, 2)
+    assert np.allclose(data[:400], 0.5, atol=1e-3)
+    assert np.allclose(data[400:], 0.3, atol=1e-3)
+
+
+def test_mix_backing_and_vocal_normalizes_clipping_peak(tmp_path: Path):
+    sr = _SR
+    backing = np.full(400, 0.8, dtype=np.float32)
+    vocal = np.full(400, 0.8, dtype=np.float32)
+
+    out_path = tmp_path / "mix.wav"
+    mix_backing_and_vocal((backing, sr), (vocal, sr), out_path, vocal_gain_db=0.0)
+
+    data, _ = sf.read(out_path)
+    assert np.allclose(data, 0.99, atol=1e-3)
+
+
+def test_mix_backing_and_vocal_streams_in_blocks(tmp_path: Path, monkeypatch):
+    sr = _SR
+    backing = np.linspace(0.2, 0.9, 1000, dtype=np.float32)
+    vocal = np.full(700, 0.5, dtype=np.float32)
+    monkeypatch.setattr(generation_mixdown, "_MIX_BLOCK", 128)
+
+    out_path = tmp_path / "mix.wav"
+    mix_backing_and_vocal((backing, sr), (vocal, sr), out_path, vocal_gain_db=0.0, subtype="FLOAT")
+
+    expected = backing.copy()
+    expected[:700] += 0.5
+    expected *= 0.99 / np.max(np.abs(expected))
+    data, _ = sf.read(out_path)
+    assert data.shape == (1000, 2)
+    assert np.allclose(data[:, 0], expected, atol=1e-5)
+    assert np.allclose(data[:, 1], expected, atol=1e-5)
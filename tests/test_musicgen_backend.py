@@ -21,71 +21,113 @@ class _DummyTensor:
         return self._data
 
 
+class _DummyModule:
+    def __init__(self):
+        self.dtype = None
+
+    def to(self, dtype=None):
+        self.dtype = dtype
+        return self
+
+
 class _DummyMusicGenModel:
     def __init__(self):
         self.sample_rate = 44100
+        self.lm = _DummyModule()
+        self.compression_model = _DummyModule()
         self.generation_params: Dict[str, Any] = {}
         self.generated_prompts: List[str] = []
+        self.generate_calls: List[List[str]] = []
 
     def set_generation_params(self, **kwargs):
         self.generation_params = kwargs
 
-    def generate(self, prompts):
+    def generate(self, prompts, progress=False):
         self.generated_prompts = list(prompts)
+        self.generate_calls.append(list(prompts))
         data = np.linspace(0.0, 1.0, num=8, dtype=np.float32)
         return [_DummyTensor(data) for _ in prompts]
 
 
-def _install_musicgen_stub(monkeypatch):
-    state: Dict[str, Any] = {}
+# Stub modules are built once at import; tests only reset the shared state dict.
+_STATE: Dict[str, Any] = {}
+
+
+class _MusicGen:
+    @staticmethod
+    def get_pretrained(model_name: str, device: str):
+        _STATE["requested_model_name"] = model_name
+        _STATE["requested_device"] = device
+        model = _DummyMusicGenModel()
+        _STATE["model"] = model
+        return model
+
+
+class _NoGrad:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _DummyTorch(types.ModuleType):
+    float16 = "float16"
+
+    def __init__(self):
+        super().__init__("torch")
+        self.cuda = types.SimpleNamespace(is_available=lambda: False)
+
+    def no_grad(self):
+        return _NoGrad()
 
-    audiocraft_pkg = types.ModuleType("audiocraft")
-    models_mod = types.ModuleType("audiocraft.models")
+    def inference_mode(self):
+        return _NoGrad()
 
-    class _MusicGen:
-        @staticmethod
-        def get_pretrained(model_name: str, device: str):
-            state["requested_model_name"] = model_name
-            state["requested_device"] = device
-            model = _DummyMusicGenModel()
-            state["model"] = model
-            return model
+    def autocast(self, device_type, dtype):
+        return _NoGrad()
 
-    models_mod.MusicGen = _MusicGen
-    audiocraft_pkg.models = models_mod
 
-    monkeypatch.setitem(sys.modules, "audiocraft", audiocraft_pkg)
-    monkeypatch.setitem(sys.modules, "audiocraft.models", models_mod)
+_AUDIOCRAFT_STUB = types.ModuleType("audiocraft")
+_MODELS_STUB = types.ModuleType("audiocraft.models")
+_MODELS_STUB.MusicGen = _MusicGen
+_AUDIOCRAFT_STUB.models = _MODELS_STUB
+_TORCH_STUB = _DummyTorch()
 
-    class _DummyTorch(types.ModuleType):
-        class _NoGrad:
-            def __enter__(self):
-                return self
 
-            def __exit__(self, exc_type, exc, tb):
-                return False
+def _install_musicgen_stub(monkeypatch):
+    monkeypatch.setitem(sys.modules, "audiocraft", _AUDIOCRAFT_STUB)
+    monkeypatch.setitem(sys.modules, "audiocraft.models", _MODELS_STUB)
+    monkeypatch.setitem(sys.modules, "torch", _TORCH_STUB)
+    _STATE.clear()
+    return _STATE
 
-        def __init__(self):
-            super().__init__("torch")
-            self.cuda = types.SimpleNamespace(is_available=lambda: False)
 
-        def no_grad(self):
-            return self._NoGrad()
+@pytest.fixture(scope="module")
+def _backend_module():
+    # Import the backend once against the stubs; it keeps references to them afterwards.
+    with pytest.MonkeyPatch.context() as mp:
+        state = _install_musicgen_stub(mp)
+        mp.delitem(sys.modules, "src.generation.musicgen_backend", raising=False)
+        module = importlib.import_module("src.generation.musicgen_backend")
+        yield module, state
 
-    monkeypatch.setitem(sys.modules, "torch", _DummyTorch())
 
-    return state
+def _reset_state(module, state: Dict[str, Any]) -> None:
+    state.clear()
+    module._load_backend.cache_clear()
 
 
-def _load_backend(monkeypatch):
-    state = _install_musicgen_stub(monkeypatch)
-    module = importlib.import_module("src.generation.musicgen_backend")
-    importlib.reload(module)
-    return module, state
+@pytest.fixture
+def backend_env(_backend_module):
+    module, state = _backend_module
+    _reset_state(module, state)
+    yield module, state
+    _reset_state(module, state)
 
 
-def test_musicgen_backend_initialization(monkeypatch):
-    backend_module, state = _load_backend(monkeypatch)
+def test_musicgen_backend_initialization(backend_env):
+    backend_module, state = backend_env
 
     backend = backend_module.MusicGenBackend(device="cpu")
     assert backend.device == "cpu"
@@ -93,8 +135,31 @@ def test_musicgen_backend_initialization(monkeypatch):
     assert backend.sample_rate == 44100
 
 
-def test_generate_clips_returns_numpy_arrays(monkeypatch):
-    backend_module, state = _load_backend(monkeypatch)
+def test_musicgen_backend_keeps_full_precision_by_default(backend_env):
+    backend_module, state = backend_env
+
+    backend = backend_module.MusicGenBackend(device="cuda")
+    assert backend.dtype is None
+    assert state["model"].lm.dtype is None
+    assert state["model"].compression_model.dtype is None
+
+
+def test_musicgen_backend_uses_half_precision_on_cuda(backend_env):
+    backend_module, state = backend_env
+
+    gpu_backend = backend_module.MusicGenBackend(device="cuda", half_precision=True)
+    assert gpu_backend.dtype == "float16"
+    assert state["model"].lm.dtype == "float16"
+    assert state["model"].compression_model.dtype == "float16"
+    assert len(gpu_backend.generate_clips(["Lo-fi beat"], duration=4)) == 1
+
+    cpu_backend = backend_module.MusicGenBackend(device="cpu", half_precision=True)
+    assert cpu_backend.dtype is None
+    assert state["model"].lm.dtype is None
+
+
+def test_generate_clips_returns_numpy_arrays(backend_env):
+    backend_module, state = backend_env
     backend = backend_module.MusicGenBackend(device="cpu")
 
     prompts = ["Calm piano", "Energetic synthwave"]
@@ -108,22 +173,58 @@ def test_generate_clips_returns_numpy_arrays(monkeypatch):
         assert clip.dtype == np.float32
 
 
-def test_generate_clips_requires_prompts(monkeypatch):
-    backend_module, _ = _load_backend(monkeypatch)
+def test_generate_clips_splits_prompts_into_batches(backend_env):
+    backend_module, state = backend_env
+    backend = backend_module.MusicGenBackend(device="cpu")
+
+    prompts = ["a", "b", "c", "d", "e"]
+    clips = backend.generate_clips(prompts, duration=5, batch_size=2)
+
+    assert len(clips) == len(prompts)
+    assert state["model"].generate_calls == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_get_backend_reuses_instances(backend_env):
+    backend_module, state = backend_env
+
+    first = backend_module.get_backend(device="cpu")
+    second = backend_module.get_backend(device="cpu")
+    assert first is second
+
+    first.warm_up()
+    assert state["model"].generated_prompts == ["warmup"]
+    assert state["model"].generation_params["duration"] == 1
+
+
+def test_get_backend_normalizes_cache_key(backend_env):
+    backend_module, _ = backend_env
+
+    default = backend_module.get_backend()
+    assert backend_module.get_backend("facebook/musicgen-small") is default
+    assert backend_module.get_backend("facebook/musicgen-small", device="cpu") is default
+    assert default.device == "cpu"
+
+    compiled = backend_module.get_backend(compile_lm=True)
+    assert compiled is not default
+
+
+def test_generate_clips_requires_prompts(backend_env):
+    backend_module, _ = backend_env
     backend = backend_module.MusicGenBackend(device="cpu")
 
     with pytest.raises(ValueError):
         backend.generate_clips([])
 
 
-def test_save_wav_writes_file(monkeypatch, tmp_path):
-    backend_module, _ = _load_backend(monkeypatch)
+def test_save_wav_writes_file(backend_env, monkeypatch, tmp_path):
+    backend_module, _ = backend_env
     written = {}
 
-    def fake_write(path, data, sample_rate):
+    def fake_write(path, data, sample_rate, subtype=None):
         written["path"] = path
         written["data"] = data
         written["sr"] = sample_rate
+        written["subtype"] = subtype
 
     monkeypatch.setattr(backend_module.sf, "write", fake_write)
 
@@ -131,6 +232,7 @@ def test_save_wav_writes_file(monkeypatch, tmp_path):
     output_path = tmp_path / "clips" / "demo.wav"
     backend_module.MusicGenBackend.save_wav(wave, output_path, 16000)
 
-    assert "clips/demo.wav" in written["path"].replace("\\", "/")
+    assert written["path"] == output_path
     np.testing.assert_allclose(written["data"], wave)
     assert written["sr"] == 16000
+    assert written["subtype"] == "PCM_16"
@@ -1,3 +1,6 @@
+from dataclasses import dataclass, field
+from typing import List
+
 import pytest
 
 from src.style import style_profile
@@ -31,35 +34,43 @@ def test_build_style_profile_requires_non_empty_features():
         build_style_profile([])
 
 
-class _DummyResponse:
-    def __init__(self, text: str):
-        self.output_text = text
+@dataclass(slots=True)
+class _Content:
+    text: str
+
+
+@dataclass(slots=True)
+class _Output:
+    content: List[_Content]
 
-        class _Content:
-            def __init__(self, text: str):
-                self.text = text
 
-        class _Output:
-            def __init__(self, text: str):
-                self.content = [_Content(text)]
+@dataclass(slots=True)
+class _DummyResponse:
+    output_text: str
+    output: List[_Output] = field(init=False)
 
-        self.output = [_Output(text)]
+    def __post_init__(self):
+        self.output = [_Output([_Content(self.output_text)])]
 
 
+@dataclass(slots=True)
 class _DummyResponsesAPI:
-    def __init__(self, response_text: str, state: dict):
-        self._response_text = response_text
-        self._state = state
+    _response_text: str
+    _state: dict
 
     def create(self, **kwargs):
         self._state["create_kwargs"] = kwargs
         return _DummyResponse(self._response_text)
 
 
+@dataclass(slots=True)
 class _DummyClient:
-    def __init__(self, response_text: str = "Smooth and upbeat."):
-        self._state = {}
-        self.responses = _DummyResponsesAPI(response_text, self._state)
+    response_text: str = "Smooth and upbeat."
+    _state: dict = field(init=False, default_factory=dict)
+    responses: _DummyResponsesAPI = field(init=False)
+
+    def __post_init__(self):
+        self.responses = _DummyResponsesAPI(self.response_text, self._state)
 
     @property
     def call_kwargs(self):
@@ -83,6 +94,13 @@ def test_describe_style_uses_openai_client():
     assert "Tempo range" in kwargs["input"][1]["content"]
 
 
+def test_extract_response_text_rejects_whitespace_only_content():
+    response = _DummyResponse("  \n ")
+
+    with pytest.raises(RuntimeError, match="Failed to extract text"):
+        style_profile._extract_response_text(response)
+
+
 def test_describe_style_without_client_requires_api_key(monkeypatch):
     profile = {
         "tempo_range": [90.0, 110.0],
@@ -109,3 +127,63 @@ def test_describe_style_without_client_uses_internal_client(monkeypatch):
 
     output = style_profile.describe_style_with_llm(profile)
     assert "Dreamy" in output
+
+
+def test_describe_style_cached_reuses_description(monkeypatch, tmp_path):
+    profile = {
+        "tempo_range": [90.0, 110.0],
+        "tempo_mean": 100.0,
+        "energy_profile": {"low": 0.5, "mid": 0.3, "high": 0.2},
+    }
+    calls = []
+
+    def fake_describe(style, *, model):
+        calls.append(model)
+        return "Warm and steady."
+
+    monkeypatch.setattr(style_profile, "describe_style_with_llm", fake_describe)
+
+    first = style_profile.describe_style_with_llm_cached(profile, cache_dir=tmp_path)
+    second = style_profile.describe_style_with_llm_cached(profile, cache_dir=tmp_path)
+    style_profile.describe_style_with_llm_cached(profile, model="other-model", cache_dir=tmp_path)
+
+    assert first == second == "Warm and steady."
+    assert calls == ["gpt-5.1", "other-model"]
+
+
+def test_describe_style_cached_ignores_entries_from_older_versions(monkeypatch, tmp_path):
+    profile = {"tempo_range": [90.0, 110.0], "tempo_mean": 100.0, "energy_profile": {"low": 0.5}}
+    calls = []
+
+    def fake_describe(style, *, model):
+        calls.append(model)
+        return f"Description {len(calls)}"
+
+    monkeypatch.setattr(style_profile, "describe_style_with_llm", fake_describe)
+
+    first = style_profile.describe_style_with_llm_cached(profile, cache_dir=tmp_path)
+    monkeypatch.setattr(style_profile, "_LLM_CACHE_VERSION", style_profile._LLM_CACHE_VERSION + 1)
+    second = style_profile.describe_style_with_llm_cached(profile, cache_dir=tmp_path)
+
+    assert (first, second) == ("Description 1", "Description 2")
+    assert len(calls) == 2
+
+
+def test_create_openai_client_is_reused_per_key(monkeypatch):
+    created = []
+
+    def fake_openai(api_key):
+        created.append(api_key)
+        return object()
+
+    monkeypatch.setattr(style_profile, "OpenAI", fake_openai)
+    style_profile._openai_client_for.cache_clear()
+    monkeypatch.setenv("OPENAI_API_KEY", "key-a")
+
+    first = style_profile._create_openai_client()
+    assert style_profile._create_openai_client() is first
+
+    monkeypatch.setenv("OPENAI_API_KEY", "key-b")
+    assert style_profile._create_openai_client() is not first
+    assert created == ["key-a", "key-b"]
+    style_profile._openai_client_for.cache_clear()
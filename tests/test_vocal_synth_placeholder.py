@@ -2,8 +2,10 @@ from pathlib import Path
 
 import json
 import numpy as np
+import pytest
 import soundfile as sf
 
+from src import manifest_json
 from src.singing import SingingSynthesizer, VocalSynthesisRequest
 
 
@@ -32,9 +34,33 @@ def test_placeholder_synth_writes_audio_and_manifest(tmp_path: Path):
     assert audio_path.exists()
     data, sr = sf.read(audio_path)
     assert sr == 8000
-    assert np.allclose(data, 0.0)
+    assert not data.any()
 
     manifest_path = audio_path.with_suffix(".json")
     manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
     assert manifest["lyrics_title"] == "City Lights"
     assert manifest["style_snapshot"]["tempo_mean"] == 100.0
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_placeholder_manifest_accepts_numpy_scalars(tmp_path: Path, monkeypatch, use_orjson: bool):
+    if not use_orjson:
+        monkeypatch.setattr(manifest_json, "orjson", None)
+    elif manifest_json.orjson is None:
+        pytest.skip("orjson not installed")
+    style_profile = {"tempo_mean": np.float64(96.5), "tempo_range": np.array([90.0, 103.0])}
+    melody_path = tmp_path / "melody.mid"
+    melody_path.write_text("placeholder midi data")
+
+    request = VocalSynthesisRequest(
+        style_profile=style_profile,
+        lyrics={"title": "Echo"},
+        melody_path=melody_path,
+        output_dir=tmp_path / "vocals",
+        duration_seconds=0.1,
+        sample_rate=8000,
+    )
+    audio_path = SingingSynthesizer().synthesize(request)
+
+    manifest = json.loads(audio_path.with_suffix(".json").read_text(encoding="utf-8"))
+    assert manifest["style_snapshot"] == {"tempo_mean": 96.5, "tempo_range": [90.0, 103.0]}
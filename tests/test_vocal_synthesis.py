@@ -6,6 +6,7 @@ from src.vocals import (
     synthesize_vocals_placeholder,
     synthesize_vocals,
     register_vocal_backend,
+    vocal_synthesis,
 )
 
 
@@ -19,7 +20,7 @@ def test_synthesize_vocals_placeholder_returns_path_and_manifest(tmp_path: Path)
 
     assert result == out_path
     assert out_path.exists()
-    assert np.allclose(sf.read(out_path)[0], 0.0)
+    assert not sf.read(out_path)[0].any()
 
     manifest = out_path.with_suffix(".json")
     assert manifest.exists()
@@ -63,3 +64,9 @@ def test_synthesize_vocals_can_use_registered_backend(tmp_path: Path):
 
     assert result.exists()
     assert called["count"] == 1
+
+
+def test_lyrics_to_text_treats_missing_theme_as_empty():
+    lyrics = {"theme": None, "sections": [{"type": "verse", "lines": ["  ", ""]}]}
+
+    assert vocal_synthesis._lyrics_to_text(lyrics) == ""
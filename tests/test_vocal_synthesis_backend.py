@@ -1,6 +1,5 @@
 from pathlib import Path
 
-import numpy as np
 import pytest
 import soundfile as sf
 
@@ -25,7 +24,7 @@ def test_synthesize_vocals_defaults_to_placeholder(tmp_path, monkeypatch):
     assert out_path.exists()
     data, sr = sf.read(out_path)
     assert len(data) == int(sr * 1.5)
-    assert np.allclose(data, 0.0)
+    assert not data.any()
 
 
 def test_synthesize_vocals_ai_backend_falls_back(tmp_path, monkeypatch):
@@ -46,7 +45,7 @@ def test_synthesize_vocals_ai_backend_falls_back(tmp_path, monkeypatch):
     assert result.exists()
     data, sr = sf.read(result)
     assert len(data) == int(sr * 2.0)
-    assert np.allclose(data, 0.0)
+    assert not data.any()
 
 
 def test_synthesize_vocals_diffsinger_backend_falls_back(tmp_path, monkeypatch):
@@ -56,6 +55,7 @@ def test_synthesize_vocals_diffsinger_backend_falls_back(tmp_path, monkeypatch):
     out_path = tmp_path / "diffsinger.wav"
 
     monkeypatch.setenv("VOCALS_BACKEND", "diffsinger")
+    monkeypatch.setenv("VOCAL_ENGINE_TMP", str(tmp_path / "engine_tmp"))
     monkeypatch.setenv("VOCAL_ENGINE_CMD", "python -c \"import sys; sys.exit(1)\"")
 
     result = synthesize_vocals(
@@ -68,4 +68,41 @@ def test_synthesize_vocals_diffsinger_backend_falls_back(tmp_path, monkeypatch):
     assert result.exists()
     data, sr = sf.read(result)
     assert len(data) == int(sr * 1.0)
-    assert np.allclose(data, 0.0)
+    assert not data.any()
+
+
+def test_external_engine_reuses_lyrics_assets_in_tmp_dir(tmp_path, monkeypatch):
+    from src.vocals import vocal_synthesis
+
+    melody_path = tmp_path / "melody.mid"
+    melody_path.write_text("placeholder midi")
+    lyrics = {"title": "Reuse", "sections": [{"name": "Verse", "lines": ["Line 1"]}]}
+    out_path = tmp_path / "engine.wav"
+    out_path.write_bytes(b"stub")
+    engine_tmp = tmp_path / "engine_tmp"
+
+    writes = []
+    original_write = vocal_synthesis._write_lyrics_assets
+
+    def counting_write(lyrics_arg, directory):
+        writes.append(directory)
+        return original_write(lyrics_arg, directory)
+
+    commands = []
+    monkeypatch.setattr(vocal_synthesis, "_write_lyrics_assets", counting_write)
+    monkeypatch.setattr(vocal_synthesis.subprocess, "run", lambda command, check: commands.append(command))
+    monkeypatch.setenv("VOCAL_ENGINE_CMD", "engine --lyrics {lyrics_json} --out {out_wav}")
+
+    for _ in range(2):
+        assert vocal_synthesis._run_external_engine(
+            melody_midi=melody_path,
+            lyrics=lyrics,
+            out_wav=out_path,
+            mode="diffsinger",
+            tmp_dir=engine_tmp,
+        )
+
+    assert len(writes) == 1
+    assert writes[0].parent == engine_tmp
+    assert commands[0] == commands[1]
+    assert Path(commands[0][2]).exists()
@@ -1,7 +1,8 @@
 from pathlib import Path
+import shlex
 import subprocess
 
-from src.vocals import synthesize_vocals_external_engine
+from src.vocals import synthesize_vocals_external_engine, vocal_synthesis
 
 
 def test_synthesize_vocals_external_engine_runs_with_env(monkeypatch, tmp_path: Path):
@@ -16,7 +17,7 @@ def test_synthesize_vocals_external_engine_runs_with_env(monkeypatch, tmp_path:
 
     captured = {}
 
-    def fake_run(cmd, shell, check):
+    def fake_run(cmd, check, shell=False):
         captured["cmd"] = cmd
         captured["shell"] = shell
         captured["check"] = check
@@ -35,7 +36,7 @@ def test_synthesize_vocals_external_engine_runs_with_env(monkeypatch, tmp_path:
     )
 
     assert result == out_path
-    assert captured["shell"] is True
+    assert captured["shell"] is False
     assert captured["check"] is True
     expected_command = (
         f"echo midi={midi_path.resolve()} "
@@ -43,4 +44,74 @@ def test_synthesize_vocals_external_engine_runs_with_env(monkeypatch, tmp_path:
         f"out={out_path.resolve()} "
         f"ref={voice_ref_dir.resolve()}"
     )
-    assert captured["cmd"] == expected_command
+    assert captured["cmd"] == shlex.split(expected_command)
+
+
+def test_synthesize_vocals_external_engine_shell_opt_in(monkeypatch, tmp_path: Path):
+    midi_path = tmp_path / "melody.mid"
+    midi_path.write_text("midi-data")
+    lyrics_path = tmp_path / "lyrics.txt"
+    lyrics_path.write_text("la la la")
+    out_path = tmp_path / "output.wav"
+    out_path.write_bytes(b"stub")
+
+    captured = {}
+
+    def fake_run(cmd, check, shell=False):
+        captured["cmd"] = cmd
+        captured["shell"] = shell
+
+    monkeypatch.setenv("VOCAL_ENGINE_CMD", "engine {midi} > {out}")
+    monkeypatch.setenv("VOCAL_ENGINE_SHELL", "1")
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    synthesize_vocals_external_engine(melody_midi=midi_path, lyrics_txt=lyrics_path, out_wav=out_path)
+
+    assert captured["shell"] is True
+    assert captured["cmd"] == f"engine {midi_path.resolve()} > {out_path.resolve()}"
+
+
+def test_synthesize_vocals_external_engine_keeps_backslash_paths(monkeypatch, tmp_path: Path):
+    work_dir = tmp_path / "my dir\\take 1"
+    work_dir.mkdir()
+    midi_path = work_dir / "melody.mid"
+    midi_path.write_text("midi-data")
+    lyrics_path = work_dir / "lyrics.txt"
+    lyrics_path.write_text("la la la")
+    out_path = work_dir / "output.wav"
+    out_path.write_bytes(b"stub")
+
+    captured = {}
+
+    def fake_run(cmd, check, shell=False):
+        captured["cmd"] = cmd
+
+    monkeypatch.setenv("VOCAL_ENGINE_CMD", 'engine --midi "{midi}" {lyrics} --out={out} {ref_dir}')
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    synthesize_vocals_external_engine(melody_midi=midi_path, lyrics_txt=lyrics_path, out_wav=out_path)
+
+    assert captured["cmd"] == [
+        "engine",
+        "--midi",
+        str(midi_path.resolve()),
+        str(lyrics_path.resolve()),
+        f"--out={out_path.resolve()}",
+    ]
+
+
+def test_command_argv_splits_windows_templates(monkeypatch):
+    monkeypatch.setattr(vocal_synthesis.os, "name", "nt")
+
+    argv = vocal_synthesis._command_argv(
+        'C:\\Tools\\engine.exe --midi "{midi}" --out {out}',
+        {"midi": "C:\\Users\\me\\proj\\melody.mid", "out": "C:\\Users\\me\\proj\\out.wav"},
+    )
+
+    assert argv == [
+        "C:\\Tools\\engine.exe",
+        "--midi",
+        "C:\\Users\\me\\proj\\melody.mid",
+        "--out",
+        "C:\\Users\\me\\proj\\out.wav",
+    ]